@@ -1,3 +1,5 @@
 from .iterative_searcher import IterativeSearcher
 from .iterative_hierarchical_searcher import IterativeHierarchicalSearcher
 from .iterative_searcher import IterativeRegularSearcher
+from .result_log import ResultLog, load_sampleset
+from .run_summary import RunSummary, RunningStatistics
@@ -3,11 +3,16 @@ from Qommunity.samplers.hierarchical.hierarchical_sampler import (
 )
 from Qommunity.searchers.hierarchical_searcher import (
     HierarchicalSearcher,
+    SplitCache,
 )
-import networkx as nx
+from Qommunity.samplers.tracer import Tracer
+from .result_log import open_result_log, plain_communities, save_arrays
+from .run_summary import RunSummary
+from .runs import iterate_runs
 from time import time
 from tqdm import tqdm
 import numpy as np
+import os
 import warnings
 
 
@@ -26,9 +31,22 @@ warnings.simplefilter("always", MethodArgsWarning)
 
 
 class IterativeHierarchicalSearcher:
-    def __init__(self, sampler: HierarchicalSampler) -> None:
+    """
+    With ``trace_dir``, the phases of every run are traced (see
+    ``HierarchicalSearcher.set_tracer``) and dumped in the Chrome trace
+    format to ``{trace_dir}/run_{iteration}.json``, with the totals of
+    every phase as ``otherData``.
+    """
+
+    def __init__(
+        self,
+        sampler: HierarchicalSampler,
+        cache: SplitCache | None = None,
+        trace_dir: str | None = None,
+    ) -> None:
         self.sampler = sampler
-        self.searcher = HierarchicalSearcher(self.sampler)
+        self.searcher = HierarchicalSearcher(self.sampler, cache=cache)
+        self.trace_dir = trace_dir
 
     def _default_saving_path(self) -> str:
         return (
@@ -60,9 +78,27 @@ class IterativeHierarchicalSearcher:
         saving_path: str | None = None,
         elapse_times: bool = True,
         iterative_verbosity: int = 0,
+        workers: int | None = None,
+        seed: int | None = None,
+        resume: bool = False,
         **kwargs,
     ):
+        """
+        Run the hierarchical search ``num_runs`` times.
+
+        With ``workers`` greater than one, runs are spread over a pool of
+        processes. With ``seed`` (or ``workers``) given, the sampler is
+        reseeded before every run with a seed depending only on ``seed``
+        and the index of the run, so results do not depend on ``workers``.
+
+        With ``save_results``, every run is appended to the log
+        ``{saving_path}_runs.log`` (see ``ResultLog``) as soon as it
+        completes, and the ``.npy`` arrays are written once at the end.
+        ``resume=True`` keeps the runs already logged and skips them.
+        """
         kwargs = self._verify_kwargs(kwargs)
+        if resume and not save_results:
+            raise ValueError("resume requires save_results")
 
         if iterative_verbosity >= 1:
             print("Starting community detection iterations")
@@ -73,34 +109,49 @@ class IterativeHierarchicalSearcher:
         modularities = np.zeros((num_runs))
         communities = np.empty((num_runs), dtype=object)
         times = np.zeros((num_runs))
-
-        for iter in tqdm(range(num_runs)):
-            elapsed = time()
-            result = self.searcher.hierarchical_community_search(**kwargs)
-            times[iter] = time() - elapsed
+        results = {
+            "modularities": modularities,
+            "communities": communities,
+            "times": times,
+        }
+
+        log = open_result_log(saving_path, resume, results) if save_results else None
+        for iter, (result, elapsed) in iterate_runs(
+            self,
+            "_search_run",
+            num_runs,
+            workers,
+            seed,
+            kwargs,
+            skip=log.completed() if log else set(),
+        ):
+            times[iter] = elapsed
 
             try:
-                modularity_score = nx.community.modularity(
-                    self.searcher.sampler.G,
-                    result,
-                    resolution=self.sampler.resolution,
-                )
+                modularity_score = self.searcher.modularity(result)
             except Exception as e:
                 print(f"iteration: {iter} exception: {e}")
                 modularity_score = -1
 
-            communities[iter] = result
+            communities[iter] = plain_communities(result)
             modularities[iter] = modularity_score
 
             if save_results:
-                np.save(f"{saving_path}_modularities", modularities)
-                np.save(f"{saving_path}_communities", communities)
-                if elapse_times:
-                    np.save(f"{saving_path}_times", times)
+                log.append(
+                    iter,
+                    modularities=modularity_score,
+                    communities=communities[iter],
+                    times=elapsed,
+                )
 
             if iterative_verbosity >= 1:
                 print(f"Iteration {iter} completed")
 
+        if save_results:
+            if not elapse_times:
+                results.pop("times")
+            save_arrays(saving_path, results)
+
         if elapse_times:
             return communities, modularities, times
         return communities, modularities
@@ -111,8 +162,13 @@ class IterativeHierarchicalSearcher:
         save_results: bool = True,
         saving_path: str | None = None,
         iterative_verbosity: int = 0,
+        workers: int | None = None,
+        seed: int | None = None,
+        resume: bool = False,
         **kwargs,
     ):
+        if resume and not save_results:
+            raise ValueError("resume requires save_results")
 
         if iterative_verbosity >= 1:
             print("Starting community detection iterations")
@@ -125,52 +181,57 @@ class IterativeHierarchicalSearcher:
         times = np.zeros((num_runs))
         division_modularities = np.empty((num_runs), dtype=object)
         division_trees = np.empty((num_runs), dtype=object)
-
-        for iter in tqdm(range(num_runs)):
-            elapsed = time()
-            (
-                communities_result,
-                div_tree,
-                div_modularities,
-            ) = self.searcher.hierarchical_community_search(
-                return_modularities=True,
-                division_tree=True,
-                **kwargs,
-            )
-            times[iter] = time() - elapsed
+        results = {
+            "modularities": modularities,
+            "communities": communities,
+            "times": times,
+            "division_trees": division_trees,
+            "division_modularities": division_modularities,
+        }
+
+        log = open_result_log(saving_path, resume, results) if save_results else None
+        for iter, (
+            communities_result,
+            div_tree,
+            div_modularities,
+            elapsed,
+        ) in iterate_runs(
+            self,
+            "_sampleset_run",
+            num_runs,
+            workers,
+            seed,
+            kwargs,
+            skip=log.completed() if log else set(),
+        ):
+            times[iter] = elapsed
             division_trees[iter] = div_tree
             division_modularities[iter] = div_modularities
 
-            try:
-                modularity_score = nx.community.modularity(
-                    self.searcher.sampler.G,
-                    communities_result,
-                    resolution=self.sampler.resolution,
-                )
-            except Exception as e:
-                print(f"iteration: {iter} exception: {e}")
-                modularity_score = -1
-
-            communities[iter] = communities_result
-            modularities[iter] = modularity_score
+            # The last division tree level is the final clustering
+            communities[iter] = plain_communities(communities_result)
+            modularities[iter] = div_modularities[-1]
 
             if save_results:
-                np.save(f"{saving_path}_modularities", modularities)
-                np.save(f"{saving_path}_communities", communities)
-                np.save(f"{saving_path}_times", times)
-                np.save(f"{saving_path}_division_trees", division_trees)
-                np.save(
-                    f"{saving_path}_division_modularities",
-                    division_modularities,
+                log.append(
+                    iter,
+                    modularities=modularities[iter],
+                    communities=communities[iter],
+                    times=elapsed,
+                    division_trees=div_tree,
+                    division_modularities=div_modularities,
                 )
 
             if iterative_verbosity >= 1:
                 print(f"Iteration {iter} completed")
 
+        if save_results:
+            save_arrays(saving_path, results)
+
         dtypes = [
             ("communities", object),
-            ("modularity", np.float_),
-            ("time", np.float_),
+            ("modularity", np.float64),
+            ("time", np.float64),
             ("division_tree", object),
             ("division_modularities", object),
         ]
@@ -186,3 +247,71 @@ class IterativeHierarchicalSearcher:
         )
 
         return sampleset
+
+    def run_summary(
+        self,
+        num_runs: int,
+        best_k: int = 10,
+        sample_size: int = 0,
+        workers: int | None = None,
+        seed: int | None = None,
+        **kwargs,
+    ) -> RunSummary:
+        """
+        Run the search ``num_runs`` times keeping only a ``RunSummary``
+        (statistics, ``best_k`` partitions and a sample of ``sample_size``
+        partitions), in memory independent of ``num_runs``.
+        """
+        kwargs = self._verify_kwargs(kwargs)
+        summary = RunSummary(best_k=best_k, sample_size=sample_size, seed=seed)
+
+        for iter, (result, elapsed) in iterate_runs(
+            self, "_search_run", num_runs, workers, seed, kwargs
+        ):
+            try:
+                modularity_score = self.searcher.modularity(result)
+            except Exception as e:
+                print(f"iteration: {iter} exception: {e}")
+                modularity_score = -1
+
+            summary.update(iter, result, modularity_score, elapsed)
+
+        return summary
+
+    def _search_run(self, iteration: int, seed: int | None, kwargs: dict) -> tuple:
+        if seed is not None:
+            self.sampler.reseed(seed)
+        tracer = self._start_trace()
+        elapsed = time()
+        result = self.searcher.hierarchical_community_search(**kwargs)
+        elapsed = time() - elapsed
+        self._dump_trace(tracer, iteration)
+        return result, elapsed
+
+    def _sampleset_run(self, iteration: int, seed: int | None, kwargs: dict) -> tuple:
+        if seed is not None:
+            self.sampler.reseed(seed)
+        tracer = self._start_trace()
+        elapsed = time()
+        result = self.searcher.hierarchical_community_search(
+            return_modularities=True,
+            division_tree=True,
+            **kwargs,
+        )
+        elapsed = time() - elapsed
+        self._dump_trace(tracer, iteration)
+        return *result, elapsed
+
+    def _start_trace(self) -> Tracer | None:
+        if self.trace_dir is None:
+            return None
+        tracer = Tracer()
+        self.searcher.set_tracer(tracer)
+        return tracer
+
+    def _dump_trace(self, tracer: Tracer | None, iteration: int) -> None:
+        if tracer is None:
+            return
+        self.searcher.set_tracer(None)
+        os.makedirs(self.trace_dir, exist_ok=True)
+        tracer.dump(os.path.join(self.trace_dir, f"run_{iteration}.json"))
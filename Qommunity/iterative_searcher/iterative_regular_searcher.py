@@ -1,8 +1,9 @@
 from Qommunity.samplers.regular.regular_sampler import RegularSampler
 from Qommunity.searchers.regular_searcher import RegularSearcher
-import networkx as nx
+from .result_log import open_result_log, plain_communities, save_arrays
+from .run_summary import RunSummary
+from .runs import iterate_runs
 from time import time
-from tqdm import tqdm
 import numpy as np
 
 
@@ -25,8 +26,18 @@ class IterativeRegularSearcher:
         saving_path: str | None = None,
         elapse_times: bool = True,
         iterative_verbosity: int = 0,
+        workers: int | None = None,
+        seed: int | None = None,
+        resume: bool = False,
         **kwargs,
     ):
+        """
+        Run the search ``num_runs`` times, see
+        ``IterativeHierarchicalSearcher.run`` for ``workers``, ``seed``
+        and ``resume``.
+        """
+        if resume and not save_results:
+            raise ValueError("resume requires save_results")
 
         if iterative_verbosity >= 1:
             print("Starting community detection iterations")
@@ -36,34 +47,85 @@ class IterativeRegularSearcher:
         modularities = np.zeros((num_runs))
         communities = np.empty((num_runs), dtype=object)
         times = np.zeros((num_runs))
+        results = {
+            "modularities": modularities,
+            "communities": communities,
+            "times": times,
+        }
 
-        for iter in tqdm(range(num_runs)):
-            elapsed = time()
-            result = self.searcher.community_search(**kwargs)
-            times[iter] = time() - elapsed
+        log = open_result_log(saving_path, resume, results) if save_results else None
+        for iter, (result, elapsed) in iterate_runs(
+            self,
+            "_search_run",
+            num_runs,
+            workers,
+            seed,
+            kwargs,
+            skip=log.completed() if log else set(),
+        ):
+            times[iter] = elapsed
 
             try:
-                modularity_score = nx.community.modularity(
-                    self.searcher.sampler.G,
-                    result,
-                    resolution=self.sampler.resolution,
-                )
+                modularity_score = self.searcher.modularity(result)
             except Exception as e:
                 print(f"iteration: {iter} exception: {e}")
                 modularity_score = -1
 
-            communities[iter] = result
+            communities[iter] = plain_communities(result)
             modularities[iter] = modularity_score
 
             if save_results:
-                np.save(f"{saving_path}_modularities", modularities)
-                np.save(f"{saving_path}_communities", communities)
-                if elapse_times:
-                    np.save(f"{saving_path}_times", times)
+                log.append(
+                    iter,
+                    modularities=modularity_score,
+                    communities=communities[iter],
+                    times=elapsed,
+                )
 
             if iterative_verbosity >= 1:
                 print(f"Iteration {iter} completed")
 
+        if save_results:
+            if not elapse_times:
+                results.pop("times")
+            save_arrays(saving_path, results)
+
         if elapse_times:
             return communities, modularities, times
         return communities, modularities
+
+    def run_summary(
+        self,
+        num_runs: int,
+        best_k: int = 10,
+        sample_size: int = 0,
+        workers: int | None = None,
+        seed: int | None = None,
+        **kwargs,
+    ) -> RunSummary:
+        """
+        Run the search ``num_runs`` times keeping only a ``RunSummary``
+        (statistics, ``best_k`` partitions and a sample of ``sample_size``
+        partitions), in memory independent of ``num_runs``.
+        """
+        summary = RunSummary(best_k=best_k, sample_size=sample_size, seed=seed)
+
+        for iter, (result, elapsed) in iterate_runs(
+            self, "_search_run", num_runs, workers, seed, kwargs
+        ):
+            try:
+                modularity_score = self.searcher.modularity(result)
+            except Exception as e:
+                print(f"iteration: {iter} exception: {e}")
+                modularity_score = -1
+
+            summary.update(iter, result, modularity_score, elapsed)
+
+        return summary
+
+    def _search_run(self, iteration: int, seed: int | None, kwargs: dict) -> tuple:
+        if seed is not None:
+            self.sampler.reseed(seed)
+        elapsed = time()
+        result = self.searcher.community_search(**kwargs)
+        return result, time() - elapsed
@@ -12,9 +12,9 @@ from Qommunity.iterative_searcher.iterative_regular_searcher import (
 
 class IterativeSearcher:
     def __new__(
-        cls, sampler: HierarchicalSampler | RegularSampler
+        cls, sampler: HierarchicalSampler | RegularSampler, **kwargs
     ) -> "IterativeHierarchicalSearcher | IterativeRegularSearcher":
         if isinstance(sampler, HierarchicalSampler):
-            return IterativeHierarchicalSearcher(sampler)
+            return IterativeHierarchicalSearcher(sampler, **kwargs)
         elif isinstance(sampler, RegularSampler):
-            return IterativeRegularSearcher(sampler)
+            return IterativeRegularSearcher(sampler, **kwargs)
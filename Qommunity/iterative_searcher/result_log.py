@@ -0,0 +1,152 @@
+import numbers
+import os
+import pickle
+import struct
+import zlib
+import numpy as np
+from ..samplers.partition import Partition
+
+
+_HEADER = struct.Struct("<QI")
+
+
+class ResultLog:
+    """
+    Append-only log of the results of iterative runs.
+
+    Every run is written as one chunk - a header holding the length and
+    CRC32 of its pickled record, followed by the record - and flushed to
+    disk, so the cost of saving a run does not depend on the number of
+    runs already saved. A chunk cut short by a crash is detected by its
+    header and discarded (and overwritten by the next append).
+
+    Args:
+        path (str): path of the log file.
+        resume (bool, optional): keep the runs already in the log,
+            otherwise the log is started anew.
+    """
+
+    def __init__(self, path: str, resume: bool = False) -> None:
+        self.path = path
+        self._records = {}
+
+        valid_size = 0
+        if resume and os.path.exists(path):
+            valid_size = self._read()
+        with open(path, "ab") as file:
+            file.truncate(valid_size)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def completed(self) -> set[int]:
+        return set(self._records)
+
+    def records(self) -> dict[int, dict]:
+        return dict(self._records)
+
+    def append(self, iteration: int, **fields) -> None:
+        record = {"iteration": iteration, **fields}
+        payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(self.path, "ab") as file:
+            file.write(_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            file.flush()
+            os.fsync(file.fileno())
+        self._records[iteration] = record
+
+    def to_arrays(self, num_runs: int | None = None) -> dict[str, np.ndarray]:
+        """
+        Fields of the logged runs as arrays indexed by iteration, shaped as
+        the ones returned by ``IterativeSearcher`` - numbers as floats,
+        anything else as objects. Missing runs are left empty (zero/None).
+        """
+        if num_runs is None:
+            num_runs = max(self._records, default=-1) + 1
+
+        fields = {}
+        for record in self._records.values():
+            for field, value in record.items():
+                if field != "iteration":
+                    numeric = isinstance(value, numbers.Real)
+                    fields[field] = fields.get(field, True) and numeric
+
+        arrays = {
+            field: np.zeros(num_runs) if numeric else np.empty(num_runs, dtype=object)
+            for field, numeric in fields.items()
+        }
+        for iteration, record in self._records.items():
+            if iteration < num_runs:
+                for field, array in arrays.items():
+                    array[iteration] = record.get(field)
+        return arrays
+
+    def _read(self) -> int:
+        # Returns the size of the valid part of the log
+        offset = 0
+        with open(self.path, "rb") as file:
+            while True:
+                header = file.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                size, checksum = _HEADER.unpack(header)
+                payload = file.read(size)
+                if len(payload) < size or zlib.crc32(payload) != checksum:
+                    break
+                record = pickle.loads(payload)
+                self._records[record["iteration"]] = record
+                offset += _HEADER.size + size
+        return offset
+
+
+def open_result_log(
+    saving_path: str, resume: bool, arrays: dict[str, np.ndarray]
+) -> ResultLog:
+    """
+    Open the log of ``saving_path``. Resumed runs are copied into
+    ``arrays`` (keyed by field) and reported by ``completed``.
+    """
+    log = ResultLog(f"{saving_path}_runs.log", resume=resume)
+    for iteration, record in log.records().items():
+        missing = set(arrays) - set(record)
+        if missing:
+            raise ValueError(
+                f"cannot resume from {log.path}: its runs have no "
+                f"{', '.join(sorted(missing))} (saved by another run method?)"
+            )
+        if iteration < len(next(iter(arrays.values()))):
+            for field, array in arrays.items():
+                array[iteration] = record[field]
+    return log
+
+
+def plain_communities(communities) -> list[list]:
+    # Partitions are saved as lists of node lists, as by the earlier versions
+    if isinstance(communities, Partition):
+        return communities.to_list()
+    return communities
+
+
+def save_arrays(saving_path: str, arrays: dict[str, np.ndarray]) -> None:
+    # Final results in the format of the earlier versions
+    for field, array in arrays.items():
+        np.save(f"{saving_path}_{field}", array)
+
+
+def load_sampleset(saving_path: str) -> np.recarray:
+    """
+    Sampleset of ``IterativeHierarchicalSearcher.run_with_sampleset_info``
+    read back from the arrays saved under ``saving_path``.
+    """
+    fields = [
+        ("communities", "communities", object),
+        ("modularities", "modularity", float),
+        ("times", "time", float),
+        ("division_trees", "division_tree", object),
+        ("division_modularities", "division_modularities", object),
+    ]
+    arrays = [
+        np.load(f"{saving_path}_{field}.npy", allow_pickle=True)
+        for field, _, _ in fields
+    ]
+    dtype = [(name, kind) for _, name, kind in fields]
+    return np.rec.fromarrays(arrays, dtype=dtype)
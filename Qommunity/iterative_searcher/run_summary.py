@@ -0,0 +1,108 @@
+import heapq
+import math
+import numpy as np
+
+
+class RunningStatistics:
+    """Count, mean, variance (Welford's algorithm), minimum and maximum."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._m2 = 0.0
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """Population variance, as ``np.var``."""
+        return self._m2 / self.count if self.count else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def __repr__(self) -> str:
+        return (
+            f"RunningStatistics(count={self.count}, mean={self.mean:.6g}, "
+            f"std={self.std:.6g}, min={self.min:.6g}, max={self.max:.6g})"
+        )
+
+
+class RunSummary:
+    """
+    Summary of iterative runs kept in memory independent of their number.
+
+    Holds running statistics of the modularity and time of the runs, the
+    ``best_k`` partitions of the highest modularity, a histogram of the
+    numbers of communities and, with ``sample_size`` given, a uniform
+    sample of partitions. The sample is the set of runs of the lowest
+    priorities drawn from ``seed`` and the index of the run, so it does
+    not depend on the order in which the runs complete.
+    """
+
+    def __init__(
+        self, best_k: int = 10, sample_size: int = 0, seed: int | None = None
+    ) -> None:
+        self.best_k = best_k
+        self.sample_size = sample_size
+        self.modularity = RunningStatistics()
+        self.time = RunningStatistics()
+        self.community_counts = {}
+
+        self._best = []
+        self._sample = []
+        self._entropy = np.random.SeedSequence(seed).entropy
+
+    @property
+    def runs(self) -> int:
+        return self.modularity.count
+
+    @property
+    def best(self) -> list[tuple[float, int, list]]:
+        """``(modularity, iteration, communities)`` of the best runs."""
+        return [
+            (modularity, -negative_iteration, communities)
+            for modularity, negative_iteration, communities in sorted(
+                self._best, reverse=True
+            )
+        ]
+
+    @property
+    def sample(self) -> dict[int, list]:
+        """Sampled partitions by iteration."""
+        return dict(
+            sorted(
+                (-negative_iteration, communities)
+                for _, negative_iteration, communities in self._sample
+            )
+        )
+
+    def update(
+        self, iteration: int, communities: list, modularity: float, time: float
+    ) -> None:
+        self.modularity.update(modularity)
+        self.time.update(time)
+        count = len(communities)
+        self.community_counts[count] = self.community_counts.get(count, 0) + 1
+
+        # Ties are resolved in favour of earlier runs
+        self._push(self._best, self.best_k, (modularity, -iteration, communities))
+        if self.sample_size:
+            priority = np.random.default_rng([self._entropy, iteration]).random()
+            self._push(self._sample, self.sample_size, (-priority, -iteration, communities))
+
+    def _push(self, heap: list, size: int, entry: tuple) -> None:
+        # Keeps the ``size`` greatest entries
+        if len(heap) < size:
+            heapq.heappush(heap, entry)
+        elif size and entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
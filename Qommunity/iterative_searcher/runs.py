@@ -0,0 +1,89 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from tqdm import tqdm
+import numpy as np
+
+
+_process_searcher = None
+
+
+def run_seed(entropy: int, iteration: int) -> int:
+    """
+    Seed of the run ``iteration``, the ``iteration``-th child spawned from
+    ``SeedSequence(entropy)``. The seed of a run depends only on the
+    entropy and its index, never on the order of execution.
+    """
+    child = np.random.SeedSequence(entropy, spawn_key=(iteration,))
+    # Non-negative 31-bit integers are accepted by every sampler backend
+    return int(child.generate_state(1)[0] >> 1)
+
+
+def _init_process_searcher(searcher) -> None:
+    global _process_searcher
+    _process_searcher = searcher
+
+
+def _run_in_process(method: str, iteration: int, seed: int | None, kwargs: dict):
+    return getattr(_process_searcher, method)(iteration, seed, kwargs)
+
+
+def iterate_runs(
+    searcher,
+    method: str,
+    num_runs: int,
+    workers: int | None,
+    seed: int | None,
+    kwargs: dict,
+    skip: set[int] = frozenset(),
+):
+    """
+    Yield ``(iteration, outcome)`` of ``num_runs`` calls of
+    ``searcher.<method>(iteration, seed, kwargs)``, in the order of
+    completion.
+    Iterations in ``skip`` (e.g. completed before a restart) are not run.
+
+    With ``workers`` greater than one, runs are spread over a pool of
+    processes, each holding its own copy of ``searcher``. At most twice
+    as many runs as workers are submitted at a time, so memory does not
+    grow with ``num_runs``. Every run gets
+    its own seed of ``run_seed`` when ``seed`` is given or runs are
+    parallel, otherwise samplers keep their own state.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be equal or greater than one")
+
+    if seed is not None or (workers or 1) > 1:
+        entropy = np.random.SeedSequence(seed).entropy
+        seed_of = lambda iteration: run_seed(entropy, iteration)
+    else:
+        seed_of = lambda iteration: None
+
+    iterations = (iteration for iteration in range(num_runs) if iteration not in skip)
+    total = num_runs - len([iteration for iteration in skip if iteration < num_runs])
+
+    if (workers or 1) == 1:
+        run = getattr(searcher, method)
+        for iteration in tqdm(iterations, total=total):
+            yield iteration, run(iteration, seed_of(iteration), kwargs)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_process_searcher,
+        initargs=(searcher,),
+    ) as executor, tqdm(total=total) as progress:
+        running = {}
+        while True:
+            for iteration in iterations:
+                future = executor.submit(
+                    _run_in_process, method, iteration, seed_of(iteration), kwargs
+                )
+                running[future] = iteration
+                if len(running) >= 2 * workers:
+                    break
+            if not running:
+                return
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                progress.update()
+                yield running.pop(future), future.result()
@@ -0,0 +1,197 @@
+import hashlib
+import networkx as nx
+import numpy as np
+from .modularity_operator import ModularityOperator
+
+
+class GraphIndex:
+    """
+    Sparse index of a graph, built once and shared by consecutive splits.
+
+    Holds the CSR adjacency matrix, the weighted degree vector and the
+    total edge weight, from which modularity matrices of any community
+    are derived without walking the whole graph again. Communities are
+    lists of node positions (as in ``range(G.number_of_nodes())``), rows
+    follow the order of ``G.nodes``.
+
+    Conventions follow QHyper's ``Network``: ``total_weight`` is the sum
+    of all adjacency entries (2m) and degrees are adjacency row sums.
+    """
+
+    def __init__(self, G: nx.Graph, weight: str | None = "weight") -> None:
+        self.adjacency = nx.to_scipy_sparse_array(G, weight=weight, format="csr")
+        self.adjacency.sort_indices()
+        self.degrees = np.asarray(self.adjacency.sum(axis=1)).ravel()
+        self.total_weight = float(self.degrees.sum())
+        self.nodes = list(G)
+        self._positions = None
+        self._nodes_are_positions = None
+
+        # networkx conventions for modularity scores - self-loops
+        # count twice towards degrees
+        self._loops = self.adjacency.diagonal()
+        self._modularity_degrees = self.degrees + self._loops
+        self._two_m = self.total_weight + self._loops.sum()
+        self._fingerprint = None
+
+    @property
+    def number_of_nodes(self) -> int:
+        return self.adjacency.shape[0]
+
+    @property
+    def positions(self) -> dict:
+        """Position (row) of every node of the graph."""
+        if self._positions is None:
+            self._positions = {node: i for i, node in enumerate(self.nodes)}
+        return self._positions
+
+    @property
+    def row_nodes(self) -> list | None:
+        """Nodes of the rows, ``None`` when the nodes are their positions."""
+        if self._nodes_are_positions is None:
+            self._nodes_are_positions = self.nodes == list(range(len(self.nodes)))
+        return None if self._nodes_are_positions else self.nodes
+
+    def fingerprint(self) -> str:
+        """Digest of the weighted adjacency, identifying the graph."""
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            for array in (
+                self.adjacency.indptr,
+                self.adjacency.indices,
+                self.adjacency.data,
+            ):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def subgraph_adjacency(self, community: list):
+        community = np.asarray(community)
+        return self.adjacency[community][:, community]
+
+    def modularity_matrix(self, community: list, resolution: float = 1) -> np.ndarray:
+        """B = A - resolution * k k^T / 2m restricted to ``community``."""
+        degrees = self.degrees[community]
+        B = -resolution * np.outer(degrees, degrees) / self.total_weight
+        B += self.subgraph_adjacency(community).toarray()
+        return B
+
+    def operator(self, community: list, resolution: float = 1) -> ModularityOperator:
+        """
+        Implicit generalized modularity matrix of ``community``,
+        see ``generalized_modularity_matrix``.
+        """
+        return ModularityOperator(
+            self.subgraph_adjacency(community),
+            self.degrees[community],
+            self.total_weight,
+            resolution=resolution,
+            community=community,
+        )
+
+    def generalized_modularity_matrix(
+        self, community: list, resolution: float = 1
+    ) -> np.ndarray:
+        """
+        Modularity matrix of a subdivision of ``community`` (Newman, 2006):
+        B_g[i, j] = B[i, j] - delta_ij * sum_k B[i, k], k in ``community``.
+        """
+        return self.operator(community, resolution).to_dense()
+
+    def community_qubo(
+        self, community: list, resolution: float = 1, prefix: str = "x"
+    ) -> dict[tuple[str, str], float]:
+        """
+        Two-community modularity QUBO of ``community`` (to be minimized),
+        keyed by sorted pairs of ``f"{prefix}{node}"`` variables.
+        """
+        B = self.generalized_modularity_matrix(community, resolution)
+        names = [f"{prefix}{node}" for node in community]
+        return self._symmetric_to_qubo(B, [names])
+
+    def one_hot_qubo(
+        self, community: list, cases: int, resolution: float = 1, prefix: str = "s"
+    ) -> dict[tuple[str, str], float]:
+        """
+        Modularity objective of a ``cases``-community division with one-hot
+        encoded variables ``f"{prefix}{node * cases + case}"``.
+        """
+        B = self.modularity_matrix(community, resolution)
+        B[np.diag_indices_from(B)] = 0
+        names = [
+            [f"{prefix}{node * cases + case}" for node in community]
+            for case in range(cases)
+        ]
+        return self._symmetric_to_qubo(B, names)
+
+    def _symmetric_to_qubo(
+        self, B: np.ndarray, names: list[list[str]]
+    ) -> dict[tuple[str, str], float]:
+        rows, cols = np.triu_indices(len(B))
+        coefficients = -B[rows, cols]
+        # Off-diagonal entries appear twice in x^T B x
+        coefficients[rows != cols] *= 2
+
+        nonzero = coefficients != 0
+        rows, cols = rows[nonzero].tolist(), cols[nonzero].tolist()
+        coefficients = coefficients[nonzero].tolist()
+
+        qubo = {}
+        for case_names in names:
+            for i, j, coefficient in zip(rows, cols, coefficients):
+                a, b = case_names[i], case_names[j]
+                qubo[(a, b) if a <= b else (b, a)] = coefficient
+        return qubo
+
+    def modularity(self, labels: np.ndarray, resolution: float = 1) -> float:
+        """Modularity of a partition given as integer community labels."""
+        labels = np.asarray(labels)
+        return float(self.batch_modularity(labels[np.newaxis, :], resolution)[0])
+
+    def batch_modularity(self, labels: np.ndarray, resolution: float = 1) -> np.ndarray:
+        """
+        Modularity of many partitions at once.
+
+        Every row of ``labels`` holds the (non-negative) community labels of
+        the nodes of one partition. Results are identical to
+        ``nx.community.modularity`` - self-loops count twice towards the
+        degree and once towards the total weight, as in networkx.
+        """
+        labels = np.atleast_2d(labels)
+        partitions = len(labels)
+        degrees, two_m = self._modularity_degrees, self._two_m
+
+        rows = np.repeat(np.arange(self.number_of_nodes), np.diff(self.adjacency.indptr))
+        same = labels[:, rows] == labels[:, self.adjacency.indices]
+        intra = same @ self.adjacency.data + self._loops.sum()
+
+        # Offset labels of every partition to sum degrees in a single pass
+        size = labels.max() + 1
+        offsets = labels + size * np.arange(partitions)[:, np.newaxis]
+        community_degrees = np.bincount(
+            offsets.ravel(),
+            weights=np.tile(degrees, partitions),
+            minlength=partitions * size,
+        ).reshape(partitions, size)
+
+        return intra / two_m - resolution * (community_degrees**2).sum(axis=1) / two_m**2
+
+    def split_gain(self, c0: list, c1: list, resolution: float = 1) -> float:
+        """
+        Modularity change caused by splitting the community ``c0 + c1``
+        into ``c0`` and ``c1``, in O(size of the community + edges of the
+        smaller part):
+        dQ = -2 cut(c0, c1) / 2m + 2 * resolution * d0 * d1 / (2m)^2.
+        """
+        if len(c1) < len(c0):
+            c0, c1 = c1, c0
+
+        d0 = self._modularity_degrees[c0].sum()
+        d1 = self._modularity_degrees[c1].sum()
+
+        rows = self.adjacency[np.asarray(c0)]
+        cut = rows.data[np.isin(rows.indices, c1)].sum()
+
+        return float(
+            -2 * cut / self._two_m + 2 * resolution * d0 * d1 / self._two_m**2
+        )
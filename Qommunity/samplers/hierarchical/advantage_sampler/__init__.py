@@ -1 +1,2 @@
 from .advantage_sampler import AdvantageSampler
+from .advantage_session import AdvantageSession
@@ -1,7 +1,11 @@
-from QHyper.solvers.quantum_annealing.dwave.advantage import Advantage
-from QHyper.problems.community_detection import Network, CommunityDetectionProblem
 import networkx as nx
+import numpy as np
+from time import time
 from ..hierarchical_sampler import HierarchicalSampler
+from ...graph_index import GraphIndex
+from ...modularity_problem import ModularityProblem
+from ...utils import SampleDecoder
+from .advantage_session import AdvantageSession
 
 
 class AdvantageSampler(HierarchicalSampler):
@@ -17,9 +21,6 @@ class AdvantageSampler(HierarchicalSampler):
         chain_strength: float | None = None,
         use_clique_embedding: bool = False,
     ) -> None:
-        if not community:
-            community = [*range(G.number_of_nodes())]
-
         self.G = G
         self.resolution = resolution
         self.version = version
@@ -30,39 +31,46 @@ class AdvantageSampler(HierarchicalSampler):
         self._use_weights = use_weights
 
         weight = "weight" if use_weights else None
-        network = Network(G, resolution=resolution, weight=weight, community=community)
-        problem = CommunityDetectionProblem(
-            network, communities=2, one_hot_encoding=False
-        )
-        self.advantage = Advantage(
-            problem=problem,
+        self.index = GraphIndex(G, weight=weight)
+
+        # The D-Wave client lives as long as the sampler,
+        # consecutive communities only swap the problem
+        self.session = AdvantageSession(
             version=version,
             region=region,
             num_reads=num_reads,
             chain_strength=chain_strength,
             use_clique_embedding=use_clique_embedding,
         )
+        self.setup_time = 0.0
+        self.solve_time = 0.0
+
+        self.update_community(community)
 
     def sample_qubo_to_dict(self) -> dict:
-        sample = self.advantage.solve()
+        return self.decoder.to_dict(self.sample_qubo_to_labels(self.community))
 
-        variables = sorted(
-            [col for col in sample.probabilities.dtype.names if col.startswith("x")],
-            key=lambda x: int(x[1:]),
-        )
-        community = sample.probabilities[variables][0]
+    def sample_qubo_to_labels(self, community: list) -> np.ndarray:
+        with self.tracer.span("solve"):
+            sample = self.session.solve(self.problem)
+        self.setup_time += self.session.setup_time
+        self.solve_time = self.session.solve_time
 
-        return dict(zip(variables, community))
+        with self.tracer.span("decode"):
+            return self.decoder.decode(sample.probabilities).astype(np.int8)
 
     def update_community(self, community: list) -> None:
-        self.__init__(
-            self.G,
-            self.resolution,
-            community,
-            self._use_weights,
-            self.version,
-            self.region,
-            self.num_reads,
-            self.chain_strength,
-            self.use_clique_embedding,
-        )
+        if not community:
+            community = [*range(self.G.number_of_nodes())]
+
+        start = time()
+        self.community = community
+        qubo = self.index.community_qubo(community, self.resolution)
+        self.problem = ModularityProblem(qubo, community)
+        self.decoder = SampleDecoder(community)
+        self.setup_time = time() - start
+
+    def clone(self) -> "AdvantageSampler":
+        sampler = super().clone()
+        sampler.session = self.session.clone()
+        return sampler
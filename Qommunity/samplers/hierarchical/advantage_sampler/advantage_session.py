@@ -0,0 +1,93 @@
+from QHyper.solvers.quantum_annealing.dwave.advantage import Advantage
+from QHyper.problems.base import Problem
+from QHyper.solvers.base import SolverResult
+from dwave.embedding.pegasus import find_clique_embedding
+from time import time
+
+
+class AdvantageSession:
+    """
+    D-Wave Advantage client kept alive between consecutive solves.
+
+    The client and the QPU topology are fetched once, on the first
+    ``solve`` call; later calls only swap the problem of the solver.
+    Clique embeddings depend only on the number of variables, so they
+    are computed once per community size and reused.
+
+    Timings of the last call are available as ``setup_time``
+    (client creation and embedding) and ``solve_time`` (sampling).
+    """
+
+    def __init__(
+        self,
+        version: str = "Advantage_system5.4",
+        region: str = "eu-central-1",
+        num_reads: int = 100,
+        chain_strength: float | None = None,
+        use_clique_embedding: bool = False,
+    ) -> None:
+        self.version = version
+        self.region = region
+        self.num_reads = num_reads
+        self.chain_strength = chain_strength
+        self.use_clique_embedding = use_clique_embedding
+
+        self.setup_time = 0.0
+        self.solve_time = 0.0
+        self._advantage = None
+        self._target_graph = None
+        self._clique_embeddings = {}
+
+    def solve(self, problem: Problem) -> SolverResult:
+        start = time()
+        if self._advantage is None:
+            self._advantage = Advantage(
+                problem=problem,
+                version=self.version,
+                region=self.region,
+                num_reads=self.num_reads,
+                chain_strength=self.chain_strength,
+                use_clique_embedding=False,
+            )
+        self._advantage.problem = problem
+
+        if self.use_clique_embedding:
+            self._advantage.use_clique_embedding = True
+            self._advantage.embedding = self._get_clique_embedding(problem)
+        self.setup_time = time() - start
+
+        start = time()
+        sample = self._advantage.solve()
+        self.solve_time = time() - start
+
+        return sample
+
+    def _get_clique_embedding(self, problem: Problem) -> dict:
+        variables = sorted(problem.objective_function.get_variables())
+        size = len(variables)
+
+        if size not in self._clique_embeddings:
+            if self._target_graph is None:
+                self._target_graph = self._advantage.sampler.to_networkx_graph()
+            self._clique_embeddings[size] = find_clique_embedding(
+                size, target_graph=self._target_graph
+            )
+
+        chains = self._clique_embeddings[size]
+        return {variable: chains[i] for i, variable in enumerate(variables)}
+
+    def clone(self) -> "AdvantageSession":
+        return AdvantageSession(
+            self.version,
+            self.region,
+            self.num_reads,
+            self.chain_strength,
+            self.use_clique_embedding,
+        )
+
+    def __getstate__(self) -> dict:
+        # Cloud clients cannot be pickled, reconnect lazily
+        state = self.__dict__.copy()
+        state["_advantage"] = None
+        state["_target_graph"] = None
+        return state
@@ -1 +1,2 @@
 from .gurobi_sampler import GurobiSampler
+from .gurobi_session import GurobiSession
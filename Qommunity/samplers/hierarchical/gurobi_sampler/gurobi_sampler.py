@@ -1,7 +1,11 @@
-from QHyper.solvers.classical.gurobi import Gurobi
-from QHyper.problems.community_detection import Network, CommunityDetectionProblem
 from ..hierarchical_sampler import HierarchicalSampler
+from ...graph_index import GraphIndex
+from ...modularity_problem import ModularityProblem
+from ...utils import SampleDecoder
+from .gurobi_session import GurobiSession
+from time import time
 import networkx as nx
+import numpy as np
 
 
 class GurobiSampler(HierarchicalSampler):
@@ -15,9 +19,6 @@ class GurobiSampler(HierarchicalSampler):
         suppress_output: bool = True,
         threads: int = 0,
     ) -> None:
-        if not community:
-            community = [*range(G.number_of_nodes())]
-
         self.G = G
         self.resolution = resolution
         self.mip_gap = mip_gap
@@ -26,42 +27,50 @@ class GurobiSampler(HierarchicalSampler):
         self._use_weights = use_weights
 
         weight = "weight" if use_weights else None
-        network = Network(G, resolution=resolution, weight=weight, community=community)
-        problem = CommunityDetectionProblem(
-            network, communities=2, one_hot_encoding=False
-        )
+        self.index = GraphIndex(G, weight=weight)
 
+        # The Gurobi environment lives as long as the sampler,
+        # consecutive communities only swap the objective
         model_id = G.name
-        self.gurobi = Gurobi(
-            problem=problem,
+        self.session = GurobiSession(
             model_name=model_id,
             mip_gap=mip_gap,
             suppress_output=suppress_output,
             threads=threads,
         )
+        self.setup_time = 0.0
+        self.solve_time = 0.0
+
+        self.update_community(community)
 
     def sample_qubo_to_dict(self) -> dict:
-        sample = self.gurobi.solve()
+        return self.decoder.to_dict(self.sample_qubo_to_labels(self.community))
 
-        variables = sorted(
-            [col for col in sample.probabilities.dtype.names if col.startswith("x")],
-            key=lambda x: int(x[1:]),
-        )
-        community = sample.probabilities[variables][0]
+    def sample_qubo_to_labels(self, community: list) -> np.ndarray:
+        with self.tracer.span("solve"):
+            sample = self.session.solve(self.problem)
+        self.setup_time += self.session.setup_time
+        self.solve_time = self.session.solve_time
 
-        return dict(zip(variables, community))
+        with self.tracer.span("decode"):
+            return self.decoder.decode(sample.probabilities).astype(np.int8)
 
     def string_to_dict(s: str, prefix: str = "x") -> dict:
         result = {f"{prefix}{i}": int(s[i]) for i in range(len(s))}
         return result
 
     def update_community(self, community: list) -> None:
-        self.__init__(
-            self.G,
-            self.resolution,
-            community,
-            self._use_weights,
-            self.mip_gap,
-            self.suppress_output,
-            self.threads,
-        )
+        if not community:
+            community = [*range(self.G.number_of_nodes())]
+
+        start = time()
+        self.community = community
+        qubo = self.index.community_qubo(community, self.resolution)
+        self.problem = ModularityProblem(qubo, community)
+        self.decoder = SampleDecoder(community)
+        self.setup_time = time() - start
+
+    def clone(self) -> "GurobiSampler":
+        sampler = super().clone()
+        sampler.session = self.session.clone()
+        return sampler
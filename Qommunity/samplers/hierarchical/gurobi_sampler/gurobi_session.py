@@ -0,0 +1,92 @@
+from QHyper.problems.base import Problem
+from QHyper.solvers.base import SolverResult
+from time import time
+import gurobipy as gp
+import numpy as np
+
+
+class GurobiSession:
+    """
+    Gurobi environment kept alive between consecutive solves.
+
+    The environment (license check-out, parameters) is started once,
+    only the model holding the objective of the given problem is rebuilt
+    on every ``solve`` call. Timings of the last call are available as
+    ``setup_time`` (model construction) and ``solve_time`` (optimization).
+    """
+
+    def __init__(
+        self,
+        model_name: str = "",
+        mip_gap: float | None = None,
+        suppress_output: bool = True,
+        threads: int = 0,
+    ) -> None:
+        self.model_name = model_name
+        self.mip_gap = mip_gap
+        self.suppress_output = suppress_output
+        self.threads = threads
+
+        self.setup_time = 0.0
+        self.solve_time = 0.0
+        self._env = None
+
+    @property
+    def env(self) -> gp.Env:
+        if self._env is None:
+            env = gp.Env(empty=True)
+            if self.suppress_output:
+                env.setParam("OutputFlag", 0)
+            if self.mip_gap:
+                env.setParam("MIPGap", self.mip_gap)
+            env.setParam("Threads", self.threads)
+            env.start()
+            self._env = env
+        return self._env
+
+    def solve(self, problem: Problem) -> SolverResult:
+        start = time()
+        env = self.env
+
+        model = gp.Model(self.model_name, env=env)
+        names = sorted(problem.objective_function.get_variables())
+        variables = model.addVars(names, vtype=gp.GRB.BINARY, name=names)
+
+        objective = gp.QuadExpr()
+        for term, coefficient in problem.objective_function.terms.items():
+            if len(term) == 2:
+                objective.addTerms(coefficient, variables[term[0]], variables[term[1]])
+            elif len(term) == 1:
+                objective.addTerms(coefficient, variables[term[0]])
+            else:
+                objective.addConstant(coefficient)
+        model.setObjective(objective, gp.GRB.MINIMIZE)
+        self.setup_time = time() - start
+
+        start = time()
+        model.optimize()
+        self.solve_time = time() - start
+
+        recarray = np.recarray(
+            (1,), dtype=[(name, "i4") for name in names] + [("probability", "f8")]
+        )
+        recarray[0] = *(round(variables[name].X) for name in names), 1.0
+        model.dispose()
+
+        return SolverResult(recarray, {}, [])
+
+    def clone(self) -> "GurobiSession":
+        return GurobiSession(
+            self.model_name, self.mip_gap, self.suppress_output, self.threads
+        )
+
+    def close(self) -> None:
+        if self._env is not None:
+            self._env.dispose()
+            self._env = None
+
+    def __getstate__(self) -> dict:
+        # Gurobi environments cannot be pickled, restart it lazily
+        state = self.__dict__.copy()
+        state["_env"] = None
+        return state
@@ -1,8 +1,15 @@
+import copy
 import networkx as nx
+import numpy as np
 from abc import ABC, abstractmethod
+from ..tracer import NULL_TRACER
+from ..utils import sample_to_labels
 
 
 class HierarchicalSampler(ABC):
+    # Spans of the solver calls, set by the searchers tracing them
+    tracer = NULL_TRACER
+
     @abstractmethod
     def __init__(
         self,
@@ -19,6 +26,24 @@ class HierarchicalSampler(ABC):
     def sample_qubo_to_dict(self) -> dict:
         pass
 
+    def sample_qubo_to_labels(self, community: list) -> np.ndarray:
+        """
+        Labels (0/1, ``int8``) of the nodes of ``community`` - the one of the
+        last ``update_community`` call - in their order. Samplers decoding
+        their solvers' output to arrays override it to skip the dict.
+        """
+        return sample_to_labels(self.sample_qubo_to_dict(), community)
+
     @abstractmethod
     def update_community(self, community: list) -> None:
         pass
+
+    def clone(self) -> "HierarchicalSampler":
+        # Independent copy for concurrent workers - update_community
+        # rebinds the per-community state, so a shallow copy is enough
+        return copy.copy(self)
+
+    def reseed(self, seed: int | None) -> None:
+        # Samplers without a seed of their own are left unchanged
+        if hasattr(self, "seed"):
+            self.seed = seed
@@ -0,0 +1 @@
+from .latency_sampler import LatencySampler
@@ -0,0 +1,67 @@
+from ..local_sampler import LocalSampler
+import asyncio
+import networkx as nx
+import numpy as np
+import time
+
+
+class LatencySampler(LocalSampler):
+    """
+    Offline stand-in for a remote annealer.
+
+    Splits are solved locally as by ``LocalSampler``, after waiting
+    ``latency`` seconds plus a uniformly drawn share of ``jitter`` seconds,
+    which emulates the queue and network round-trip of a remote solver.
+    ``sample_community_async`` waits without blocking the event loop and
+    builds and solves the QUBO in worker threads, so pipelines such as
+    ``AsyncHierarchicalSearcher`` can be tested and benchmarked without
+    access to the QPU.
+    """
+
+    def __init__(
+        self,
+        G: nx.Graph,
+        resolution: float = 1,
+        community: list | None = None,
+        use_weights: bool = True,
+        latency: float = 0.5,
+        jitter: float = 0.0,
+        seed: int | None = None,
+        **local_kwargs,
+    ) -> None:
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency and jitter must be non-negative")
+
+        self.latency = latency
+        self.jitter = jitter
+        self._latency_rng = np.random.default_rng(seed)
+
+        super().__init__(
+            G,
+            resolution=resolution,
+            community=community,
+            use_weights=use_weights,
+            seed=seed,
+            **local_kwargs,
+        )
+
+    def sample_qubo_to_labels(self, community: list) -> np.ndarray:
+        with self.tracer.span("latency"):
+            time.sleep(self._delay())
+        return super().sample_qubo_to_labels(community)
+
+    async def sample_community_async(self, community: list) -> np.ndarray:
+        # Concurrent submissions must not share the per-community state
+        sampler = self.clone()
+        # Drawn before any await, in the order of the submissions
+        delay = self._delay()
+        # The QUBO and the solve run in worker threads, only the latency
+        # is waited for on the event loop
+        await asyncio.to_thread(sampler.update_community, community)
+        await asyncio.sleep(delay)
+        return await asyncio.to_thread(
+            LocalSampler.sample_qubo_to_labels, sampler, community
+        )
+
+    def _delay(self) -> float:
+        return self.latency + self.jitter * self._latency_rng.random()
@@ -0,0 +1 @@
+from .local_sampler import LocalSampler
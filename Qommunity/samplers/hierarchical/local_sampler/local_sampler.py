@@ -0,0 +1,122 @@
+from dwave.samplers import (
+    SimulatedAnnealingSampler,
+    SteepestDescentSolver,
+    TabuSampler,
+)
+import dimod
+import networkx as nx
+import numpy as np
+from time import time
+from ..hierarchical_sampler import HierarchicalSampler
+from ...graph_index import GraphIndex
+
+
+METHODS = {
+    "simulated_annealing": SimulatedAnnealingSampler,
+    "tabu": TabuSampler,
+    "steepest_descent": SteepestDescentSolver,
+}
+
+
+class LocalSampler(HierarchicalSampler):
+    """
+    Offline hierarchical sampler solving the two-community modularity QUBO
+    on the CPU with ``dwave_samplers``.
+
+    Args:
+        method (str, optional): ``"simulated_annealing"`` (default),
+            ``"tabu"`` or ``"steepest_descent"``.
+        num_reads (int, optional): number of samples drawn per split,
+            the lowest-energy one is used.
+        num_sweeps (int | None, optional): number of sweeps of simulated
+            annealing. Defaults to the ``dwave_samplers`` default.
+        seed (int | None, optional): seed of the stream of per-split seeds,
+            making whole searches reproducible.
+        **solver_kwargs: further parameters passed to the ``sample`` call,
+            e.g. ``beta_range`` or ``timeout`` (tabu).
+    """
+
+    def __init__(
+        self,
+        G: nx.Graph,
+        resolution: float = 1,
+        community: list | None = None,
+        use_weights: bool = True,
+        method: str = "simulated_annealing",
+        num_reads: int = 100,
+        num_sweeps: int | None = None,
+        seed: int | None = None,
+        **solver_kwargs,
+    ) -> None:
+        if method not in METHODS:
+            raise ValueError(
+                f"Unsupported method: {method}. "
+                f"The supported methods are: {', '.join(METHODS)}."
+            )
+        if num_sweeps is not None and method != "simulated_annealing":
+            raise ValueError("num_sweeps applies only to simulated_annealing")
+
+        self.G = G
+        self.resolution = resolution
+        self.method = method
+        self.num_reads = num_reads
+        self.num_sweeps = num_sweeps
+        self.seed = seed
+        self.solver_kwargs = solver_kwargs
+        self._use_weights = use_weights
+
+        weight = "weight" if use_weights else None
+        self.index = GraphIndex(G, weight=weight)
+        self.solver = METHODS[method]()
+        self._rng = np.random.default_rng(seed)
+
+        self.setup_time = 0.0
+        self.solve_time = 0.0
+
+        self.update_community(community)
+
+    def sample_qubo_to_dict(self) -> dict:
+        labels = self.sample_qubo_to_labels(self.community)
+        return dict(zip((f"x{node}" for node in self.community), labels.tolist()))
+
+    def sample_qubo_to_labels(self, community: list) -> np.ndarray:
+        parameters = dict(self.solver_kwargs)
+        parameters["num_reads"] = self.num_reads
+        parameters["seed"] = int(self._rng.integers(2**31))
+        if self.num_sweeps is not None:
+            parameters["num_sweeps"] = self.num_sweeps
+
+        start = time()
+        with self.tracer.span("solve", method=self.method):
+            sampleset = self.solver.sample(self.bqm, **parameters)
+        self.solve_time = time() - start
+
+        # Variables of the BQM are positions within the community
+        with self.tracer.span("decode"):
+            record = sampleset.record
+            best = record.sample[np.argmin(record.energy)]
+            labels = np.empty(len(self.community), dtype=np.int8)
+            labels[np.asarray(sampleset.variables)] = best
+
+        return labels
+
+    def update_community(self, community: list) -> None:
+        if not community:
+            community = [*range(self.G.number_of_nodes())]
+
+        start = time()
+        self.community = community
+        operator = self.index.operator(community, self.resolution)
+        # Energy x^T Q x with Q = -B_g, as in GraphIndex.community_qubo
+        self.bqm = dimod.BinaryQuadraticModel(-operator.to_dense(), "BINARY")
+        self.setup_time = time() - start
+
+    def clone(self) -> "LocalSampler":
+        sampler = super().clone()
+        sampler.solver = METHODS[self.method]()
+        sampler._rng = np.random.default_rng(self._rng.integers(2**31))
+        return sampler
+
+    def reseed(self, seed: int | None) -> None:
+        super().reseed(seed)
+        self._rng = np.random.default_rng(seed)
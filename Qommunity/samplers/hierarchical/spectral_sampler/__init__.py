@@ -0,0 +1 @@
+from .spectral_sampler import SpectralSampler
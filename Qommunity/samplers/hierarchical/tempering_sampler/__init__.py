@@ -0,0 +1,2 @@
+from .tempering_sampler import TemperingSampler
+from .parallel_tempering import ParallelTempering
@@ -0,0 +1,86 @@
+from ..hierarchical_sampler import HierarchicalSampler
+from ...graph_index import GraphIndex
+from .parallel_tempering import ParallelTempering
+from time import time
+import networkx as nx
+import numpy as np
+
+
+class TemperingSampler(HierarchicalSampler):
+    """
+    Hierarchical sampler running vectorised parallel tempering
+    (see ``ParallelTempering``) on the two-community modularity QUBO.
+
+    After every ``sample_qubo_to_labels`` call the best sample and energy
+    of every replica are kept in ``replica_samples`` and
+    ``replica_energies``, the returned split is the lowest-energy one.
+    """
+
+    def __init__(
+        self,
+        G: nx.Graph,
+        resolution: float = 1,
+        community: list | None = None,
+        use_weights: bool = True,
+        num_replicas: int = 16,
+        num_sweeps: int = 100,
+        beta_range: tuple[float, float] | None = None,
+        block_size: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self.G = G
+        self.resolution = resolution
+        self.num_replicas = num_replicas
+        self.num_sweeps = num_sweeps
+        self.beta_range = beta_range
+        self.block_size = block_size
+        self.seed = seed
+        self._use_weights = use_weights
+
+        weight = "weight" if use_weights else None
+        self.index = GraphIndex(G, weight=weight)
+        self._rng = np.random.default_rng(seed)
+
+        self.replica_samples = None
+        self.replica_energies = None
+        self.setup_time = 0.0
+        self.solve_time = 0.0
+
+        self.update_community(community)
+
+    def sample_qubo_to_dict(self) -> dict:
+        labels = self.sample_qubo_to_labels(self.community)
+        return dict(zip((f"x{node}" for node in self.community), labels.tolist()))
+
+    def sample_qubo_to_labels(self, community: list) -> np.ndarray:
+        start = time()
+        with self.tracer.span("solve"):
+            samples, energies = self.engine.run(self.num_sweeps, self._rng)
+        self.solve_time = time() - start
+
+        self.replica_samples = samples
+        self.replica_energies = energies
+        return samples[np.argmin(energies)].astype(np.int8)
+
+    def update_community(self, community: list) -> None:
+        if not community:
+            community = [*range(self.G.number_of_nodes())]
+
+        start = time()
+        self.community = community
+        self.engine = ParallelTempering(
+            self.index.operator(community, self.resolution),
+            num_replicas=self.num_replicas,
+            beta_range=self.beta_range,
+            block_size=self.block_size,
+        )
+        self.setup_time = time() - start
+
+    def clone(self) -> "TemperingSampler":
+        sampler = super().clone()
+        sampler._rng = np.random.default_rng(self._rng.integers(2**31))
+        return sampler
+
+    def reseed(self, seed: int | None) -> None:
+        super().reseed(seed)
+        self._rng = np.random.default_rng(seed)
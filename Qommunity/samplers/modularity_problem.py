@@ -0,0 +1,20 @@
+from collections import defaultdict
+from QHyper.problems.base import Problem
+from QHyper.polynomial import Polynomial
+
+
+class ModularityProblem(Problem):
+    """
+    QHyper problem wrapping a precomputed modularity QUBO.
+
+    Lightweight replacement of ``CommunityDetectionProblem`` for QUBOs
+    derived from a ``GraphIndex`` - no dense graph matrices and no SymPy
+    symbols are created.
+    """
+
+    def __init__(self, qubo: dict[tuple[str, ...], float], community: list) -> None:
+        # Keys are already sorted and merged, skip Polynomial normalization
+        self.objective_function = Polynomial({})
+        self.objective_function.terms = defaultdict(float, qubo)
+        self.constraints = []
+        self.community = community
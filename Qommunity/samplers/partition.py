@@ -0,0 +1,151 @@
+from collections import Counter
+from collections.abc import Sequence
+from .utils import communities_to_labels
+import numpy as np
+
+
+class Partition(Sequence):
+    """
+    Partition of the nodes of a graph, stored as an ``int32`` array of
+    community labels (4 bytes per node).
+
+    A Partition behaves as the list of communities it replaces - it can
+    be indexed, iterated and compared with a list of lists. The list view
+    (``to_list``) is built once, on first use: communities are ordered by
+    their labels and their nodes by position. ``same_communities``
+    compares partitions regardless of the order of communities and of
+    their nodes.
+
+    Labels are indexed by node position. ``nodes`` (the graph nodes of the
+    positions, e.g. ``GraphIndex.row_nodes``) make the list view and
+    ``to_dict`` hold graph nodes instead of positions.
+    """
+
+    def __init__(self, labels: np.ndarray, nodes: list | None = None) -> None:
+        labels = np.array(labels, dtype=np.int32)
+        if labels.ndim != 1:
+            raise ValueError("labels must be a one-dimensional array")
+        if len(labels) and labels.min() < 0:
+            raise ValueError("labels must be non-negative")
+        if nodes is not None and len(nodes) != len(labels):
+            raise ValueError("nodes must have one node per label")
+        labels.flags.writeable = False
+        self._labels = labels
+        self._nodes = nodes
+        self._communities = None
+
+    @classmethod
+    def from_communities(
+        cls,
+        communities: list,
+        number_of_nodes: int | None = None,
+        positions: dict | None = None,
+    ) -> "Partition":
+        """
+        Partition of a list of communities, labelled by their positions.
+        Communities of graph nodes are translated through ``positions``,
+        see ``communities_to_labels``.
+        """
+        if isinstance(communities, Partition):
+            return communities
+        if number_of_nodes is None:
+            number_of_nodes = (
+                len(positions)
+                if positions is not None
+                else sum(len(community) for community in communities)
+            )
+        return cls(communities_to_labels(communities, number_of_nodes, positions))
+
+    @property
+    def labels(self) -> np.ndarray:
+        return self._labels
+
+    @property
+    def nodes(self) -> list | None:
+        return self._nodes
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self._labels)
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.bincount(self._labels, minlength=len(self))
+
+    def __len__(self) -> int:
+        return int(self._labels.max()) + 1 if len(self._labels) else 0
+
+    def __getitem__(self, index):
+        return self.to_list()[index]
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __eq__(self, other) -> bool:
+        # Compared as the list view, like a list of lists
+        if isinstance(other, Partition):
+            return self.to_list() == other.to_list()
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Partition({self.to_list()})"
+
+    def __getstate__(self) -> dict:
+        # The list view is rebuilt on demand
+        return {"_labels": self._labels, "_nodes": self._nodes}
+
+    def __setstate__(self, state: dict) -> None:
+        self._labels = state["_labels"]
+        self._nodes = state.get("_nodes")
+        self._labels.flags.writeable = False
+        self._communities = None
+
+    def same_communities(self, other) -> bool:
+        """
+        Whether ``other`` (a Partition or a list of communities) has the
+        same communities, in any order and with their nodes in any order.
+        """
+        if isinstance(other, Partition):
+            if self._nodes == other._nodes:
+                return np.array_equal(
+                    self._canonical_labels(), other._canonical_labels()
+                )
+            return self._community_sets() == other._community_sets()
+        return self._community_sets() == Counter(
+            frozenset(community) for community in other if len(community)
+        )
+
+    def _canonical_labels(self) -> np.ndarray:
+        # Labels renumbered in the order of their first nodes
+        _, first, inverse = np.unique(
+            self._labels, return_index=True, return_inverse=True
+        )
+        ranks = np.empty_like(first)
+        ranks[np.argsort(first)] = np.arange(len(first))
+        return ranks[inverse]
+
+    def _community_sets(self) -> Counter:
+        return Counter(frozenset(community) for community in self if community)
+
+    def to_list(self) -> list[list[int]]:
+        if self._communities is None:
+            order = np.argsort(self._labels, kind="stable")
+            boundaries = np.cumsum(self.sizes)[:-1]
+            self._communities = [
+                community.tolist() for community in np.split(order, boundaries)
+            ]
+            if self._nodes is not None:
+                self._communities = [
+                    [self._nodes[position] for position in community]
+                    for community in self._communities
+                ]
+        return self._communities
+
+    def to_dict(self, prefix: str = "x") -> dict:
+        """Sample of the partition, as ``communities_to_dict``."""
+        nodes = self._nodes if self._nodes is not None else range(len(self._labels))
+        return {f"{prefix}{node}": int(label) for node, label in zip(nodes, self._labels)}
@@ -1,8 +1,10 @@
 from QHyper.solvers.quantum_annealing.dqm import DQM
-from QHyper.problems.community_detection import Network, CommunityDetectionProblem
 import networkx as nx
+import numpy as np
 from ..regular_sampler import RegularSampler
-from ...utils import communities_to_list
+from ...graph_index import GraphIndex
+from ...modularity_problem import ModularityProblem
+from ...utils import SampleDecoder, labels_to_communities
 
 
 class DQMSampler(RegularSampler):
@@ -24,26 +26,21 @@ class DQMSampler(RegularSampler):
         self.communities_number = cases
 
         weights = "weight" if use_weights else None
-        network = Network(G, resolution=resolution, weight=weights, community=community)
-        problem = CommunityDetectionProblem(network, communities=cases)
+        self.index = GraphIndex(G, weight=weights)
+        qubo = self.index.one_hot_qubo(community, cases, resolution)
+        problem = ModularityProblem(qubo, community)
         self.dqm = DQM(problem=problem, time=time, cases=cases)
+        self.community = community
+        self.decoder = SampleDecoder(community, prefix="s", missing=-1)
 
     def sample_qubo_to_dict(self) -> dict:
-        sample = self.dqm.solve()
-
-        variables = sorted(
-            [col for col in sample.probabilities.dtype.names if col.startswith("s")],
-            key=lambda s: int(s[1:]),
-        )
-        community = sample.probabilities[variables][0]
+        return self.decoder.to_dict(self.sample_qubo_to_labels())
 
-        return dict(zip(variables, community))
+    def sample_qubo_to_labels(self) -> np.ndarray:
+        """Cases of the nodes of the community, in its order."""
+        sample = self.dqm.solve()
+        return self.decoder.decode(sample.probabilities)
 
     def sample_qubo_to_list(self) -> list:
-        sample = self.sample_qubo_to_dict()
-        communities = communities_to_list(sample, self.communities_number)
-        result = []
-        for community in communities:
-            result.append([int(x[1:]) for x in community])
-
-        return result
+        labels = self.sample_qubo_to_labels()
+        return labels_to_communities(labels, self.community, self.communities_number)
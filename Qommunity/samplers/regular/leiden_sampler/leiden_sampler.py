@@ -6,7 +6,13 @@ from ...utils import communities_to_dict
 
 
 class LeidenSampler(RegularSampler):
-    def __init__(self, G: nx.Graph, use_weights: bool = True, resolution: float = 1):
+    def __init__(
+        self,
+        G: nx.Graph,
+        use_weights: bool = True,
+        resolution: float = 1,
+        seed: int | None = None,
+    ):
         self.G = G
         G_weights = list(nx.get_edge_attributes(G, "weight").values())
         self.weights = (
@@ -15,6 +21,7 @@ class LeidenSampler(RegularSampler):
             else None
         )
         self.resolution = resolution
+        self.seed = seed
 
     def sample_qubo_to_dict(self) -> dict:
         communities = list(
@@ -23,6 +30,7 @@ class LeidenSampler(RegularSampler):
                 partition_type=la.RBConfigurationVertexPartition,
                 weights=self.weights,
                 resolution_parameter=self.resolution,
+                seed=self.seed,
             )
         )
         self.communities_number = len(communities)
@@ -36,6 +44,7 @@ class LeidenSampler(RegularSampler):
                 partition_type=la.RBConfigurationVertexPartition,
                 weights=self.weights,
                 resolution_parameter=self.resolution,
+                seed=self.seed,
             )
         )
         return sample
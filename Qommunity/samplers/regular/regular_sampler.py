@@ -19,3 +19,8 @@ class RegularSampler(ABC):
     @abstractmethod
     def sample_qubo_to_list(self) -> list:
         pass
+
+    def reseed(self, seed: int | None) -> None:
+        # Samplers without a seed of their own are left unchanged
+        if hasattr(self, "seed"):
+            self.seed = seed
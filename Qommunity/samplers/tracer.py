@@ -0,0 +1,96 @@
+from contextlib import contextmanager, nullcontext
+from time import perf_counter_ns
+import json
+import math
+import os
+import threading
+
+
+class Tracer:
+    """
+    Records spans - named, timed phases of a search with their arguments
+    (e.g. community size, depth and sampler) - and exports them in the
+    Chrome trace event format, read by ``chrome://tracing`` and Perfetto.
+
+    Spans of every thread are recorded, each thread as a track of its own.
+    Spans recorded in other processes (e.g. ``ParallelHierarchicalSearcher``
+    with ``executor="process"``) stay in their copies of the tracer.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self._events = []
+        self._origin = perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str, **args):
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._events.append(
+                (name, start, perf_counter_ns(), threading.get_ident(), args)
+            )
+
+    def clear(self) -> None:
+        self._events = []
+        self._origin = perf_counter_ns()
+
+    def totals(self) -> dict[str, dict]:
+        """
+        Number of spans and their total seconds, by name. Nested spans are
+        counted in every enclosing span as well (e.g. ``solve`` in
+        ``sample``).
+        """
+        totals = {}
+        for name, start, stop, _, _ in self._events:
+            total = totals.setdefault(name, {"count": 0, "seconds": []})
+            total["count"] += 1
+            total["seconds"].append((stop - start) / 1e9)
+        for total in totals.values():
+            total["seconds"] = math.fsum(total["seconds"])
+        return totals
+
+    def to_chrome(self) -> dict:
+        """Trace events of the spans, with the ``totals`` as ``otherData``."""
+        pid = os.getpid()
+        # Threads are numbered in the order of their first spans
+        threads = {}
+        events = []
+        for name, start, stop, thread, args in sorted(
+            self._events, key=lambda event: (event[1], -event[2])
+        ):
+            events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1e3,
+                    "dur": (stop - start) / 1e3,
+                    "pid": pid,
+                    "tid": threads.setdefault(thread, len(threads)),
+                    "args": args,
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"totals": self.totals()},
+        }
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as file:
+            json.dump(self.to_chrome(), file)
+
+
+class NullTracer:
+    """Tracer recording nothing, the default of searchers and samplers."""
+
+    enabled = False
+    _span = nullcontext()
+
+    def span(self, name: str, **args):
+        return self._span
+
+
+NULL_TRACER = NullTracer()
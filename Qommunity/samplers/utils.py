@@ -1,11 +1,14 @@
+from numpy.lib import recfunctions
+import numpy as np
+
+
 def communities_to_list(sample, communities_number) -> list:
-    communities = []
-    for k in range(communities_number):
-        subcommunity = []
-        for i in sample:
-            if sample[i] == k:
-                subcommunity.append(i)
-        communities.append(subcommunity)
+    # One pass over the sample, labels outside the range are left out
+    communities = [[] for _ in range(communities_number)]
+    for variable, value in sample.items():
+        label = int(value)
+        if label == value and 0 <= label < communities_number:
+            communities[label].append(variable)
 
     return communities
 
@@ -17,3 +20,91 @@ def communities_to_dict(communities) -> dict:
             result[f"x{j}"] = i
 
     return result
+
+
+def communities_to_labels(
+    communities, number_of_nodes: int, positions: dict | None = None
+) -> np.ndarray:
+    """
+    Community labels of the nodes, by node position. Communities of graph
+    nodes are translated to positions through ``positions`` (node -> row,
+    see ``GraphIndex.positions``), otherwise nodes are their positions.
+    """
+    labels = np.full(number_of_nodes, -1, dtype=np.int32)
+    assigned = 0
+    for i, community in enumerate(communities):
+        if positions is not None:
+            try:
+                community = [positions[node] for node in community]
+            except KeyError:
+                raise ValueError("communities are not a partition of the graph")
+        community = np.fromiter(community, dtype=np.int64)
+        if (labels[community] != -1).any():
+            raise ValueError("communities are not a partition of the graph")
+        labels[community] = i
+        assigned += len(community)
+
+    if assigned != number_of_nodes or (labels == -1).any():
+        raise ValueError("communities are not a partition of the graph")
+
+    return labels
+
+
+def sample_to_labels(sample: dict, community: list, prefix: str = "x") -> np.ndarray:
+    """
+    Labels (0/1) of the nodes of ``community`` in a binary sample, nodes
+    with values other than 0 (or missing from the sample) are labelled 1.
+    """
+    return np.fromiter(
+        (sample.get(f"{prefix}{node}") != 0 for node in community),
+        dtype=np.int8,
+        count=len(community),
+    )
+
+
+class SampleDecoder:
+    """
+    Decodes the first sample of a solver's record array into a vector of
+    the values of ``f"{prefix}{node}"`` for the nodes of ``community``.
+
+    The names of the variables are formatted once per community and the
+    permutation of the record columns once per column layout, so decoding
+    a sample does not format or parse a string per node. Variables missing
+    from the record get the value ``missing``.
+    """
+
+    def __init__(self, community: list, prefix: str = "x", missing: int = 1) -> None:
+        self.variables = [f"{prefix}{node}" for node in community]
+        self.missing = missing
+        self._names = None
+        self._columns = None
+
+    def decode(self, probabilities: np.ndarray) -> np.ndarray:
+        names = probabilities.dtype.names
+        if names != self._names:
+            position = {name: i for i, name in enumerate(names)}
+            self._columns = np.fromiter(
+                (position.get(variable, len(names)) for variable in self.variables),
+                dtype=np.intp,
+                count=len(self.variables),
+            )
+            self._names = names
+
+        row = recfunctions.structured_to_unstructured(probabilities[:1])[0]
+        return np.append(row, self.missing)[self._columns].astype(np.int64)
+
+    def to_dict(self, values: np.ndarray) -> dict:
+        return dict(zip(self.variables, values.tolist()))
+
+
+def labels_to_communities(
+    labels: np.ndarray, community: list, communities_number: int
+) -> list:
+    """Nodes of ``community`` grouped by their labels, via a stable sort."""
+    labels = np.asarray(labels)
+    nodes = np.asarray(community)
+    inside = (labels >= 0) & (labels < communities_number)
+    labels, nodes = labels[inside], nodes[inside]
+    order = np.argsort(labels, kind="stable")
+    boundaries = np.cumsum(np.bincount(labels, minlength=communities_number))[:-1]
+    return [part.tolist() for part in np.split(nodes[order], boundaries)]
@@ -1 +1,6 @@
+from .division_tree import DivisionTree
 from .hierarchical_searcher import HierarchicalSearcher
+from .parallel_hierarchical_searcher import ParallelHierarchicalSearcher
+from .refinement import KernighanLinRefinement
+from .split_cache import SplitCache
+from .async_hierarchical_searcher import AsyncHierarchicalSearcher
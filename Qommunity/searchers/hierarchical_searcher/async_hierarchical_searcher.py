@@ -0,0 +1,71 @@
+from Qommunity.samplers.hierarchical.hierarchical_sampler import HierarchicalSampler
+from Qommunity.samplers.tracer import Tracer
+from .parallel_hierarchical_searcher import ParallelHierarchicalSearcher
+from .refinement import KernighanLinRefinement
+from .split_cache import SplitCache
+from contextlib import contextmanager
+import asyncio
+import threading
+
+
+class AsyncHierarchicalSearcher(ParallelHierarchicalSearcher):
+    """
+    Hierarchical searcher submitting independent splits concurrently to
+    samplers bound by remote round-trips.
+
+    Samplers defining a coroutine ``sample_community_async(community)``
+    returning the labels of ``sample_qubo_to_labels`` (e.g.
+    ``LatencySampler``) are driven by an event loop running in a
+    background thread, with at most ``max_in_flight`` submissions pending.
+    Meanwhile the calling thread post-processes every returned split
+    (refinement, caching, division tree bookkeeping) and submits its
+    subcommunities right away. Other samplers are called from
+    ``max_in_flight`` threads, each with its own ``sampler.clone()``.
+
+    Results are identical in structure and order to the ones of
+    ``HierarchicalSearcher``.
+    """
+
+    def __init__(
+        self,
+        sampler: HierarchicalSampler,
+        max_in_flight: int = 16,
+        refinement: KernighanLinRefinement | None = None,
+        cache: SplitCache | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be equal or greater than one")
+
+        super().__init__(
+            sampler,
+            workers=max_in_flight,
+            executor="thread",
+            refinement=refinement,
+            cache=cache,
+            tracer=tracer,
+        )
+        self.max_in_flight = max_in_flight
+
+    async def hierarchical_community_search_async(self, **kwargs) -> list:
+        """``hierarchical_community_search`` awaitable from a running loop."""
+        return await asyncio.to_thread(self.hierarchical_community_search, **kwargs)
+
+    def _worker_pool(self):
+        if not hasattr(self.sampler, "sample_community_async"):
+            return super()._worker_pool()
+        return self._event_loop_pool()
+
+    @contextmanager
+    def _event_loop_pool(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            yield lambda community, level: asyncio.run_coroutine_threadsafe(
+                self.sampler.sample_community_async(community), loop
+            )
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
@@ -0,0 +1,187 @@
+import math
+import numpy as np
+
+
+class DivisionTree:
+    """
+    Binary tree of the splits of a hierarchical search.
+
+    Every cluster (the root community and each subcommunity produced by a
+    split) is identified by its index, in the order of creation. A split
+    cluster has two children; a leaf is either indivisible (its sample
+    did not divide it) or was never sampled (a single node). Split clusters
+    hold the modularity gain of their split (NaN when not computed).
+
+    The tree is filled during the search and converted on demand to the
+    division tree levels returned by ``hierarchical_community_search``
+    (``to_levels``) and to a SciPy linkage matrix (``linkage``).
+    """
+
+    def __init__(self, community: list) -> None:
+        self._parent = [-1]
+        self._children = [None]
+        self._depth = [0]
+        self._gain = [math.nan]
+        self._indivisible = [False]
+        self._communities = [community]
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def split(
+        self, cluster: int, c0: list, c1: list, gain: float = math.nan
+    ) -> tuple[int, int]:
+        """Add the two subcommunities of ``cluster``, returning their indices."""
+        if self._children[cluster] is not None or self._indivisible[cluster]:
+            raise ValueError(f"cluster {cluster} is already resolved")
+        first = len(self._parent)
+        self._children[cluster] = (first, first + 1)
+        self._gain[cluster] = gain
+        for community in (c0, c1):
+            self._parent.append(cluster)
+            self._children.append(None)
+            self._depth.append(self._depth[cluster] + 1)
+            self._gain.append(math.nan)
+            self._indivisible.append(False)
+            self._communities.append(community)
+        return first, first + 1
+
+    def mark_indivisible(self, cluster: int) -> None:
+        if self._children[cluster] is not None:
+            raise ValueError(f"cluster {cluster} is already split")
+        self._indivisible[cluster] = True
+
+    def community(self, cluster: int) -> list:
+        return self._communities[cluster]
+
+    @property
+    def parent(self) -> np.ndarray:
+        """Parent of every cluster, -1 for the root."""
+        return np.array(self._parent, dtype=np.int32)
+
+    @property
+    def children(self) -> np.ndarray:
+        """``(clusters, 2)`` children of every cluster, -1 for leaves."""
+        children = np.full((len(self), 2), -1, dtype=np.int32)
+        split = [c for c, pair in enumerate(self._children) if pair is not None]
+        children[split] = [self._children[c] for c in split]
+        return children
+
+    @property
+    def depth(self) -> np.ndarray:
+        return np.array(self._depth, dtype=np.int32)
+
+    @property
+    def gain(self) -> np.ndarray:
+        return np.array(self._gain)
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.array([len(c) for c in self._communities], dtype=np.int64)
+
+    def preorder(self) -> list[int]:
+        """Clusters in the order of the depth-first search, c0 before c1."""
+        order = []
+        stack = [0]
+        while stack:
+            cluster = stack.pop()
+            order.append(cluster)
+            if self._children[cluster] is not None:
+                c0, c1 = self._children[cluster]
+                stack.append(c1)
+                stack.append(c0)
+        return order
+
+    def leaves(self) -> list[int]:
+        """Leaf clusters in the order of the search results."""
+        return [c for c in self.preorder() if self._children[c] is None]
+
+    def labels(self, number_of_nodes: int | None = None) -> np.ndarray:
+        """
+        Position of the leaf of every node (as in ``leaves``), -1 for nodes
+        outside the root community.
+        """
+        if number_of_nodes is None:
+            number_of_nodes = max(self._communities[0], default=-1) + 1
+        labels = np.full(number_of_nodes, -1, dtype=np.int32)
+        for position, leaf in enumerate(self.leaves()):
+            labels[np.asarray(self._communities[leaf], dtype=np.int64)] = position
+        return labels
+
+    def level_gains(self) -> list[float]:
+        """Exact sums of the split gains of the clusters at every depth."""
+        gains = {}
+        for cluster, pair in enumerate(self._children):
+            if pair is not None:
+                gains.setdefault(self._depth[cluster], []).append(self._gain[cluster])
+        return [math.fsum(gains.get(depth, [])) for depth in range(max(gains, default=-1) + 1)]
+
+    def to_levels(self) -> list[list[list]]:
+        """
+        Division tree levels: the first one holds the root community, every
+        next one the subcommunities of the splits of sampled clusters (or
+        the clusters themselves when indivisible), in the depth-first order,
+        followed by the leaves of the previous level. The last level is
+        dropped when it repeats the previous one.
+        """
+        sampled = [
+            pair is not None or indivisible
+            for pair, indivisible in zip(self._children, self._indivisible)
+        ]
+        if not sampled[0]:
+            return []
+
+        by_depth = {}
+        for cluster in self.preorder():
+            if sampled[cluster]:
+                by_depth.setdefault(self._depth[cluster], []).append(cluster)
+
+        levels = [[0]]
+        for depth in range(len(by_depth)):
+            level = []
+            for cluster in by_depth[depth]:
+                if self._children[cluster] is not None:
+                    level.extend(self._children[cluster])
+                else:
+                    level.append(cluster)
+            # Clusters of the previous level not divided any further
+            level.extend(
+                cluster
+                for cluster in levels[-1]
+                if not (self._depth[cluster] == depth and sampled[cluster])
+            )
+            levels.append(level)
+
+        # Without a split at the deepest level the partition is unchanged
+        if all(self._children[c] is None for c in by_depth[len(by_depth) - 1]):
+            levels.pop()
+
+        return [[self._communities[c] for c in level] for level in levels]
+
+    def linkage(self) -> np.ndarray:
+        """
+        SciPy linkage matrix (``scipy.cluster.hierarchy``) of the tree, with
+        the leaves (in the order of ``leaves``) as observations. The distance
+        of a split is the height of the tree above its depth, so splits made
+        earlier in the search merge last.
+        """
+        leaves = self.leaves()
+        identifier = {leaf: position for position, leaf in enumerate(leaves)}
+        internal = [c for c, pair in enumerate(self._children) if pair is not None]
+        height = max(self._depth) if internal else 0
+
+        # Deepest splits first, children are always merged before parents
+        internal.sort(key=lambda c: -self._depth[c])
+        counts = {leaf: 1 for leaf in leaves}
+        Z = np.empty((len(internal), 4))
+        for row, cluster in enumerate(internal):
+            c0, c1 = self._children[cluster]
+            counts[cluster] = counts[c0] + counts[c1]
+            Z[row] = (
+                identifier[c0],
+                identifier[c1],
+                height - self._depth[cluster],
+                counts[cluster],
+            )
+            identifier[cluster] = len(leaves) + row
+        return Z
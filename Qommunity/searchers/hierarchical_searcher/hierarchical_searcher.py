@@ -1,10 +1,52 @@
 from Qommunity.samplers.hierarchical.hierarchical_sampler import HierarchicalSampler
-import networkx as nx
+from Qommunity.samplers.graph_index import GraphIndex
+from Qommunity.samplers.partition import Partition
+from Qommunity.samplers.tracer import NULL_TRACER, Tracer
+from Qommunity.samplers.utils import sample_to_labels
+from .division_tree import DivisionTree
+from .refinement import KernighanLinRefinement
+from .split_cache import SplitCache, sampler_parameters
+import math
+import numpy as np
 
 
 class HierarchicalSearcher:
-    def __init__(self, sampler: HierarchicalSampler) -> None:
+    def __init__(
+        self,
+        sampler: HierarchicalSampler,
+        refinement: KernighanLinRefinement | None = None,
+        cache: SplitCache | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
         self.sampler = sampler
+        self.refinement = refinement
+        self.cache = cache
+        self._graph_index = None
+        self._split_gains = False
+        self.set_tracer(tracer)
+
+    def set_tracer(self, tracer: Tracer | None) -> None:
+        """
+        Record the phases of every split (``cache``, ``qubo``, ``sample``,
+        ``split``, ``modularity``) and the solver calls of the sampler as
+        spans of ``tracer``, ``None`` to stop tracing.
+        """
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.sampler.tracer = self.tracer
+
+    @property
+    def graph_index(self) -> GraphIndex:
+        # Weighted as in nx.community.modularity, regardless of the sampler
+        if self._graph_index is None:
+            self._graph_index = GraphIndex(self.sampler.G)
+        return self._graph_index
+
+    def modularity(self, communities: Partition | list) -> float:
+        # Lists hold graph nodes, as in nx.community.modularity
+        partition = Partition.from_communities(
+            communities, positions=self.graph_index.positions
+        )
+        return self.graph_index.modularity(partition.labels, self.sampler.resolution)
 
     def single_community_search(
         self, verbosity: int = 0, community: list | None = None
@@ -21,7 +63,7 @@ class HierarchicalSearcher:
 
         sample = self.sampler.sample_qubo_to_dict()
 
-        c0, c1 = self._split_dict_to_lists(sample, community)
+        c0, c1 = self._split_sample(sample_to_labels(sample, community), community)
 
         if verbosity >= 2:
             print("Base community:", community, sep="\n")
@@ -41,67 +83,58 @@ class HierarchicalSearcher:
         self,
         verbosity: int = 0,
         max_depth: int | None = None,
-        division_tree: bool = False,
+        division_tree: bool | str = False,
         return_modularities: bool = False,
     ) -> list:
+        """
+        With ``division_tree=True`` the division tree is returned as a list
+        of levels (lists of communities), with ``division_tree="tree"`` as
+        the ``DivisionTree`` built during the search.
+        """
+        if division_tree not in (False, True, "tree"):
+            raise ValueError("division_tree must be a boolean or 'tree'")
+
         if verbosity >= 1:
             print("Starting community detection")
 
         if max_depth == None:
-            if division_tree == False:
-                division_tree = None
-            else:
-                division_tree = []
-
-            result = self._hierarchical_search_recursion(
-                verbosity=verbosity,
-                level=1,
-                max_depth=max_depth,
-                division_tree=division_tree,
+            community = [*range(self.sampler.G.number_of_nodes())]
+            tree = DivisionTree(community) if division_tree else None
+            # Modularity gains of the splits are kept in the tree
+            self._split_gains = tree is not None and return_modularities
+
+            try:
+                with self._span("search", community, 0):
+                    result = self._hierarchical_search_recursion(
+                        verbosity=verbosity,
+                        level=1,
+                        max_depth=max_depth,
+                        community=community,
+                        tree=tree,
+                    )
+            finally:
+                self._split_gains = False
+            result = Partition.from_communities(
+                result, self.sampler.G.number_of_nodes()
             )
 
             if division_tree:
-                for i in range(1, len(division_tree)):
-                    # Flatten the list
-                    lower_list_elements = self._flatten_list_to_set(division_tree[i])
-
-                    # Rewrite unincluded communities
-                    for sublist in division_tree[i - 1]:
-                        if not set(sublist).issubset(lower_list_elements):
-                            unique_to_sublist = set(sublist) - lower_list_elements
-                            if unique_to_sublist:
-                                division_tree[i].append(sublist)
-
-                # Check if the two last divisions are the same
-                # - unify the order of nodes within the community lists
-                # and the order of communities within the list of communities
-                def list_of_lists_sorted(list_of_lists: list[list]) -> list[list]:
-                    return sorted([sorted(sublist) for sublist in list_of_lists])
-
-                # Compare if they're the same
-                higher_list_elements = list_of_lists_sorted(division_tree[-2])
-                lower_list_elements = list_of_lists_sorted(division_tree[-1])
-
-                # Remove the last division if it repeats itself
-                if higher_list_elements == lower_list_elements:
-                    division_tree.pop(-1)
+                with self._span("division_tree", community, 0):
+                    levels = tree.to_levels()
+                division_tree = tree if division_tree == "tree" else levels
 
             if division_tree and return_modularities:
-                division_modularities = []
-                for division in division_tree:
-                    division_modularity = nx.community.modularity(
-                        G=self.sampler.G,
-                        communities=division,
-                        resolution=self.sampler.resolution,
-                    )
-                    division_modularities.append(division_modularity)
+                # Each level differs from the previous one only by its splits,
+                # the first level (whole graph) has modularity 1 - resolution
+                gains = tree.level_gains()
+                division_modularities = [1 - self.sampler.resolution]
+                for depth in range(len(levels) - 1):
+                    gain = gains[depth] if depth < len(gains) else 0.0
+                    division_modularities.append(division_modularities[-1] + gain)
 
             elif return_modularities:
-                division_modularities = nx.community.modularity(
-                    G=self.sampler.G,
-                    communities=result,
-                    resolution=self.sampler.resolution,
-                )
+                with self._span("modularity", community, 0):
+                    division_modularities = self.modularity(result)
 
             if verbosity >= 1:
                 print("Stopping community detection")
@@ -109,7 +142,7 @@ class HierarchicalSearcher:
                 print(result)
                 if division_tree:
                     print("Division tree")
-                    for division in division_tree:
+                    for division in levels:
                         print(division)
 
             if division_tree and return_modularities:
@@ -132,7 +165,8 @@ class HierarchicalSearcher:
         max_depth: int,
         level: int,
         community: list | None = None,
-        division_tree: list | None = None,
+        tree: DivisionTree | None = None,
+        cluster: int = 0,
     ):
         if not community:
             community = [*range(self.sampler.G.number_of_nodes())]
@@ -140,9 +174,6 @@ class HierarchicalSearcher:
         if len(community) == 1:
             return [community]
 
-        if level == 1 and division_tree == []:
-            division_tree.append([community])
-
         if verbosity >= 2:
             print("===========================================")
             print(
@@ -153,26 +184,22 @@ class HierarchicalSearcher:
             )
             print("===========================================")
 
-        self.sampler.update_community(community)
-        sample = self.sampler.sample_qubo_to_dict()
+        labels = self._sample(community, level)
 
-        c0, c1 = self._split_dict_to_lists(sample, community)
+        with self._span("split", community, level):
+            c0, c1 = self._split_sample(labels, community)
+        subclusters = self._record_split(tree, cluster, c0, c1, level)
 
         if verbosity >= 2:
             print("Base community:", community, sep="\n")
             print("Community division:", c0, c1, sep="\n")
+            if hasattr(self.sampler, "solve_time"):
+                print(
+                    f"Setup time: {self.sampler.setup_time:.4f} s,",
+                    f"solve time: {self.sampler.solve_time:.4f} s",
+                )
             print("===========================================")
 
-        if division_tree:
-            if len(division_tree) < level + 1:
-                division_tree.append([])
-
-            if c0 and c1:
-                division_tree[level].append(c0)
-                division_tree[level].append(c1)
-            else:
-                division_tree[level].append(community)
-
         if level == max_depth:
             if c0 and c1:
                 return [c0] + [c1]
@@ -188,33 +215,94 @@ class HierarchicalSearcher:
                     max_depth,
                     level=level + 1,
                     community=c0,
-                    division_tree=division_tree,
+                    tree=tree,
+                    cluster=subclusters[0],
                 ) + self._hierarchical_search_recursion(
                     verbosity,
                     max_depth,
                     level=level + 1,
                     community=c1,
-                    division_tree=division_tree,
+                    tree=tree,
+                    cluster=subclusters[1],
                 )
             elif c0:
                 return [c0]
             else:
                 return [c1]
 
-    def _split_dict_to_lists(self, dictionary, community):
-        c0, c1 = [], []
-        for i in community:
-            value = dictionary.get(f"x{i}", None)
-            if value == 0:
-                c0.append(i)
-            else:
-                c1.append(i)
+    def _record_split(
+        self,
+        tree: DivisionTree | None,
+        cluster: int,
+        c0: list,
+        c1: list,
+        level: int = 0,
+    ) -> tuple[int, int]:
+        # Tree indices of the subcommunities, -1 without a tree or a split
+        if tree is None:
+            return -1, -1
+        if not (c0 and c1):
+            tree.mark_indivisible(cluster)
+            return -1, -1
+        gain = math.nan
+        if self._split_gains:
+            with self._span("modularity", tree.community(cluster), level):
+                gain = self.graph_index.split_gain(c0, c1, self.sampler.resolution)
+        return tree.split(cluster, c0, c1, gain)
+
+    def _span(self, name: str, community: list, level: int):
+        return self.tracer.span(
+            name,
+            size=len(community),
+            depth=level,
+            sampler=type(self.sampler).__name__,
+        )
+
+    def _sample(self, community: list, level: int = 0) -> np.ndarray:
+        labels = None
+        if self.cache is not None:
+            with self._span("cache", community, level):
+                labels = self._cached_sample(community)
+        if labels is None:
+            with self._span("qubo", community, level):
+                self.sampler.update_community(community)
+            with self._span("sample", community, level):
+                labels = self.sampler.sample_qubo_to_labels(community)
+            if self.cache is not None:
+                with self._span("cache", community, level):
+                    self._store_sample(community, labels)
+        return labels
+
+    def _cached_sample(self, community: list) -> np.ndarray | None:
+        if self.cache is None:
+            return None
+        c0 = self.cache.get(self._cache_key(community))
+        if c0 is None:
+            return None
+        return np.isin(community, c0, invert=True).astype(np.int8)
+
+    def _store_sample(self, community: list, labels: np.ndarray) -> None:
+        if self.cache is None:
+            return
+        c0 = np.asarray(community)[labels == 0].tolist()
+        self.cache.put(self._cache_key(community), c0)
+
+    def _cache_key(self, community: list) -> str:
+        return self.cache.key(
+            self.graph_index.fingerprint(),
+            community,
+            self.sampler.resolution,
+            sampler_parameters(self.sampler),
+        )
+
+    def _split_sample(
+        self, labels: np.ndarray, community: list
+    ) -> tuple[list, list]:
+        nodes = np.asarray(community)
+        in_c0 = labels == 0
+        c0, c1 = nodes[in_c0].tolist(), nodes[~in_c0].tolist()
+        if self.refinement is not None:
+            c0, c1 = self.refinement.refine(
+                self.graph_index, c0, c1, self.sampler.resolution
+            )
         return c0, c1
-
-    def _flatten_list_to_set(self, list) -> set:
-        result = set()
-        for sublist in list:
-            for item in sublist:
-                result.add(item)
-
-        return result
@@ -0,0 +1,213 @@
+from Qommunity.samplers.hierarchical.hierarchical_sampler import HierarchicalSampler
+from Qommunity.samplers.tracer import Tracer
+from .division_tree import DivisionTree
+from .hierarchical_searcher import HierarchicalSearcher
+from .refinement import KernighanLinRefinement
+from .split_cache import SplitCache
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from queue import Queue
+import heapq
+import itertools
+import numpy as np
+import os
+
+
+_process_sampler = None
+
+
+def _init_process_sampler(sampler: HierarchicalSampler) -> None:
+    global _process_sampler
+    _process_sampler = sampler
+
+
+def _sample_in_process(community: list) -> np.ndarray:
+    _process_sampler.update_community(community)
+    return _process_sampler.sample_qubo_to_labels(community)
+
+
+class ParallelHierarchicalSearcher(HierarchicalSearcher):
+    """
+    Hierarchical searcher expanding the division tree with a work queue.
+
+    Every community waiting for a split is kept in a priority queue
+    (largest communities first) and dispatched to a pool of workers as soon
+    as its parent split finishes, so independent subtrees are solved
+    concurrently and no Python recursion is involved.
+
+    The outputs of ``hierarchical_community_search`` are identical to the
+    ones of ``HierarchicalSearcher`` - communities and division tree levels
+    are ordered as in the depth-first recursion, regardless of the order
+    in which the splits have completed.
+
+    Args:
+        sampler (HierarchicalSampler): sampler used for every split.
+        workers (int | None, optional): number of concurrent splits.
+            Defaults to the number of CPUs.
+        executor (str, optional): ``"thread"`` (default) - every worker
+            thread uses its own ``sampler.clone()``; ``"process"`` - the
+            sampler is pickled once to each worker process.
+        refinement (KernighanLinRefinement | None, optional): refinement
+            applied to every split, see ``HierarchicalSearcher``.
+        cache (SplitCache | None, optional): cache of splits, only accessed
+            by the calling thread - cached splits are not dispatched.
+        tracer (Tracer | None, optional): see ``HierarchicalSearcher``.
+            Samples of worker threads are traced on their own tracks,
+            samples of worker processes are not traced.
+    """
+
+    def __init__(
+        self,
+        sampler: HierarchicalSampler,
+        workers: int | None = None,
+        executor: str = "thread",
+        refinement: KernighanLinRefinement | None = None,
+        cache: SplitCache | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
+        super().__init__(sampler, refinement=refinement, cache=cache, tracer=tracer)
+
+        if executor not in ("thread", "process"):
+            raise ValueError("executor must be either 'thread' or 'process'")
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be equal or greater than one")
+
+        self.workers = workers if workers else os.cpu_count() or 1
+        self.executor = executor
+
+    def _hierarchical_search_recursion(
+        self,
+        verbosity: bool,
+        max_depth: int,
+        level: int,
+        community: list | None = None,
+        tree: DivisionTree | None = None,
+        cluster: int = 0,
+    ):
+        if not community:
+            community = [*range(self.sampler.G.number_of_nodes())]
+
+        if len(community) == 1:
+            return [community]
+
+        # Paths (tuples of 0/1 branch choices) order the communities
+        # exactly as the depth-first recursion would visit them
+        leaves = []
+        order = itertools.count()
+        pending = [(-len(community), next(order), level, (), community, cluster)]
+
+        with self._worker_pool() as submit:
+            running = {}
+            while pending or running:
+                while pending and len(running) < self.workers:
+                    _, _, task_level, path, task_community, task_cluster = (
+                        heapq.heappop(pending)
+                    )
+                    if verbosity >= 2:
+                        print("===========================================")
+                        print(
+                            "Calculations for graph with",
+                            len(task_community),
+                            "nodes, level of recursion:",
+                            task_level,
+                        )
+                        print("===========================================")
+                    labels = None
+                    if self.cache is not None:
+                        with self._span("cache", task_community, task_level):
+                            labels = self._cached_sample(task_community)
+                    if labels is None:
+                        future = submit(task_community, task_level)
+                    else:
+                        future = Future()
+                        future.set_result(labels)
+                    running[future] = (
+                        task_level,
+                        path,
+                        task_community,
+                        task_cluster,
+                        labels,
+                    )
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_level, path, task_community, task_cluster, cached = (
+                        running.pop(future)
+                    )
+                    if cached is None and self.cache is not None:
+                        with self._span("cache", task_community, task_level):
+                            self._store_sample(task_community, future.result())
+                    with self._span("split", task_community, task_level):
+                        c0, c1 = self._split_sample(
+                            future.result(), task_community
+                        )
+                    subclusters = self._record_split(
+                        tree, task_cluster, c0, c1, task_level
+                    )
+
+                    if verbosity >= 2:
+                        print("Base community:", task_community, sep="\n")
+                        print("Community division:", c0, c1, sep="\n")
+                        print("===========================================")
+
+                    if not (c0 and c1):
+                        leaves.append((path, c0 if c0 else c1))
+                        continue
+
+                    for branch, subcommunity in enumerate((c0, c1)):
+                        subpath = path + (branch,)
+                        if task_level == max_depth or len(subcommunity) == 1:
+                            leaves.append((subpath, subcommunity))
+                        else:
+                            heapq.heappush(
+                                pending,
+                                (
+                                    -len(subcommunity),
+                                    next(order),
+                                    task_level + 1,
+                                    subpath,
+                                    subcommunity,
+                                    subclusters[branch],
+                                ),
+                            )
+
+        return [c for _, c in sorted(leaves, key=lambda e: e[0])]
+
+    @contextmanager
+    def _worker_pool(self):
+        if self.executor == "process":
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_process_sampler,
+                initargs=(self.sampler,),
+            ) as executor:
+                yield lambda community, level: executor.submit(
+                    _sample_in_process, community
+                )
+            return
+
+        # Every thread borrows its own sampler, as samplers are stateful
+        samplers = Queue()
+        for _ in range(self.workers):
+            samplers.put(self.sampler.clone())
+
+        def sample_in_thread(community: list, level: int) -> np.ndarray:
+            sampler = samplers.get()
+            try:
+                with self._span("qubo", community, level):
+                    sampler.update_community(community)
+                with self._span("sample", community, level):
+                    return sampler.sample_qubo_to_labels(community)
+            finally:
+                samplers.put(sampler)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            yield lambda community, level: executor.submit(
+                sample_in_thread, community, level
+            )
@@ -0,0 +1,140 @@
+from Qommunity.samplers.hierarchical.hierarchical_sampler import HierarchicalSampler
+from collections import OrderedDict
+from contextlib import closing
+import hashlib
+import inspect
+import json
+import sqlite3
+import threading
+
+
+def sampler_parameters(sampler: HierarchicalSampler) -> dict:
+    """
+    Parameters of ``sampler`` identifying its splits - the arguments of
+    its ``__init__`` (other than the graph and the community) stored as
+    public or underscored attributes.
+    """
+    parameters = {"class": type(sampler).__qualname__}
+    for name in inspect.signature(type(sampler).__init__).parameters:
+        if name in ("self", "G", "community"):
+            continue
+        for attribute in (name, f"_{name}"):
+            if hasattr(sampler, attribute):
+                parameters[name] = getattr(sampler, attribute)
+                break
+    return parameters
+
+
+class SplitCache:
+    """
+    Memoisation of the splits of communities.
+
+    A split is stored as the nodes of its first part, under a key built
+    from the graph fingerprint, the set of nodes of the community, the
+    resolution and the sampler parameters. The most recently used
+    ``maxsize`` splits are kept in memory; with ``path`` given, all splits
+    are also stored in an SQLite database that can be shared by processes
+    and reused by later sessions.
+
+    Caching is meant for deterministic samplers - a cached split is
+    returned even if the sampler would produce another one.
+
+    ``hits`` counts splits found in memory or on disk (``disk_hits``),
+    ``misses`` the ones that had to be sampled.
+    """
+
+    def __init__(self, maxsize: int | None = 1024, path: str | None = None) -> None:
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize must be non-negative")
+
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._splits = OrderedDict()
+        self._lock = threading.Lock()
+        if path is not None:
+            with closing(self._connect()) as connection, connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS splits (key TEXT PRIMARY KEY, c0 TEXT)"
+                )
+
+    def __getstate__(self) -> dict:
+        # Copies sent to other processes start with their own lock
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._splits)
+
+    @staticmethod
+    def key(
+        fingerprint: str, community: list, resolution: float, parameters: dict
+    ) -> str:
+        content = json.dumps(
+            [fingerprint, sorted(community), resolution, parameters],
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha1(content.encode()).hexdigest()
+
+    def get(self, key: str) -> list | None:
+        with self._lock:
+            if key in self._splits:
+                self._splits.move_to_end(key)
+                self.hits += 1
+                return self._splits[key]
+
+        c0 = self._load(key)
+        with self._lock:
+            if c0 is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, c0)
+        return c0
+
+    def put(self, key: str, c0: list) -> None:
+        with self._lock:
+            self._remember(key, c0)
+        if self.path is not None:
+            with closing(self._connect()) as connection, connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO splits VALUES (?, ?)",
+                    (key, json.dumps(c0)),
+                )
+
+    def clear(self) -> None:
+        """Forget the splits kept in memory and reset the counters."""
+        with self._lock:
+            self._splits.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def _remember(self, key: str, c0: list) -> None:
+        if self.maxsize == 0:
+            return
+        self._splits[key] = c0
+        self._splits.move_to_end(key)
+        if self.maxsize is not None and len(self._splits) > self.maxsize:
+            self._splits.popitem(last=False)
+
+    def _load(self, key: str) -> list | None:
+        if self.path is None:
+            return None
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT c0 FROM splits WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
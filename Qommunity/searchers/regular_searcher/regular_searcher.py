@@ -1,9 +1,27 @@
 from Qommunity.samplers.regular.regular_sampler import RegularSampler
+from Qommunity.samplers.graph_index import GraphIndex
+from Qommunity.samplers.partition import Partition
+from Qommunity.samplers.utils import communities_to_labels
 
 
 class RegularSearcher:
     def __init__(self, sampler: RegularSampler) -> None:
         self.sampler = sampler
+        self._graph_index = None
+
+    @property
+    def graph_index(self) -> GraphIndex:
+        # Weighted as in nx.community.modularity, regardless of the sampler
+        if self._graph_index is None:
+            self._graph_index = GraphIndex(self.sampler.G)
+        return self._graph_index
+
+    def modularity(self, communities: Partition | list) -> float:
+        # Lists hold graph nodes, as in nx.community.modularity
+        partition = Partition.from_communities(
+            communities, positions=self.graph_index.positions
+        )
+        return self.graph_index.modularity(partition.labels, self.sampler.resolution)
 
     def community_search(
         self,
@@ -22,7 +40,14 @@ class RegularSearcher:
             print("===========================================")
 
         if return_list:
-            sample = self.sampler.sample_qubo_to_list()
+            # Sampler communities hold graph nodes, the Partition maps them
+            # to positions and back
+            labels = communities_to_labels(
+                self.sampler.sample_qubo_to_list(),
+                self.graph_index.number_of_nodes,
+                self.graph_index.positions,
+            )
+            sample = Partition(labels, self.graph_index.row_nodes)
         else:
             sample = self.sampler.sample_qubo_to_dict()
 
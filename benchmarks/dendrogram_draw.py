@@ -0,0 +1,68 @@
+"""
+Draw time of ``Dendrogram.draw`` and ``Dendrogram.draw_horizontal`` against
+the number of nodes, on rings of cliques split by ``SpectralSampler``, and of
+``Dendrogram.draw`` truncated to the last 30 clusters.
+
+    python -m benchmarks.dendrogram_draw [max_nodes]
+"""
+import sys
+from time import perf_counter
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import networkx as nx
+
+from dendro import Dendrogram
+from Qommunity.samplers.hierarchical.spectral_sampler import SpectralSampler
+from Qommunity.searchers.hierarchical_searcher import HierarchicalSearcher
+
+
+def dendrogram(number_of_nodes: int, clique_size: int = 8) -> Dendrogram:
+    G = nx.ring_of_cliques(number_of_nodes // clique_size, clique_size)
+    searcher = HierarchicalSearcher(SpectralSampler(G, seed=0))
+    communities, division_tree, division_modularities = (
+        searcher.hierarchical_community_search(
+            division_tree=True, return_modularities=True
+        )
+    )
+    return Dendrogram(
+        G, [list(c) for c in communities], division_modularities, division_tree
+    )
+
+
+def time_draw(dendro: Dendrogram, horizontal: bool, **kwargs) -> tuple[float, int]:
+    # Seconds and number of artists on the axes
+    start = perf_counter()
+    if horizontal:
+        dendro.draw_horizontal(show_plot=False, tight_layout=False, **kwargs)
+    else:
+        dendro.draw(show_plot=False, tight_layout=False, **kwargs)
+    dendro.R["fig"].canvas.draw()
+    elapsed = perf_counter() - start
+    ax = dendro.R["ax"]
+    artists = len(ax.collections) + len(ax.lines)
+    plt.close(dendro.R["fig"])
+    return elapsed, artists
+
+
+def main(max_nodes: int = 4096) -> None:
+    print(
+        f"{'nodes':>8} {'vertical [s]':>13} {'horizontal [s]':>15} "
+        f"{'lastp 30 [s]':>13} {'artists':>8}"
+    )
+    number_of_nodes = 64
+    while number_of_nodes <= max_nodes:
+        dendro = dendrogram(number_of_nodes)
+        vertical, artists = time_draw(dendro, horizontal=False)
+        horizontal, _ = time_draw(dendro, horizontal=True)
+        truncated, _ = time_draw(dendro, False, truncate_mode="lastp", p=30)
+        print(
+            f"{number_of_nodes:>8} {vertical:>13.3f} {horizontal:>15.3f} "
+            f"{truncated:>13.3f} {artists:>8}"
+        )
+        number_of_nodes *= 4
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
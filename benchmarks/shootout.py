@@ -0,0 +1,307 @@
+"""
+Shoot-out of the offline samplers: every sampler is run by
+``IterativeSearcher`` over a grid of graph families, sizes and
+resolutions, and every run becomes a row of a tidy table (CSV) of wall
+time, solver time, modularity and number of communities.
+
+    python -m benchmarks.shootout --sizes 100 400 --runs 5 -o shootout.csv
+    python -m benchmarks.shootout -s louvain -s spectral --target 0.95
+    python -m benchmarks.shootout -s gurobi -s bayan --sizes 32
+
+The exact solvers (Gurobi and Bayan) may take minutes per graph, they are
+run only when selected. Samplers whose dependencies (or licences) are
+missing get rows with an ``error`` and no measurements. With ``--target``, the
+fastest sampler reaching that fraction of the best mean modularity is
+reported for every graph.
+"""
+import argparse
+import csv
+import functools
+import inspect
+import sys
+from importlib import import_module
+from time import perf_counter
+import networkx as nx
+import numpy as np
+
+from Qommunity.iterative_searcher import IterativeSearcher
+from Qommunity.iterative_searcher.runs import iterate_runs
+
+
+FIELDS = [
+    "family",
+    "size",
+    "resolution",
+    "sampler",
+    "run",
+    "wall_time",
+    "solver_time",
+    "modularity",
+    "communities",
+    "error",
+]
+
+FAMILIES = {
+    "barabasi_albert": lambda n, seed: nx.barabasi_albert_graph(n, 3, seed=seed),
+    "erdos_renyi": lambda n, seed: nx.gnp_random_graph(n, 8 / n, seed=seed),
+    "powerlaw_cluster": lambda n, seed: nx.powerlaw_cluster_graph(
+        n, 3, 0.1, seed=seed
+    ),
+    "clique_chain": lambda n, seed: nx.ring_of_cliques(max(n // 8, 2), 8),
+}
+
+# Module, class and constructor arguments of every sampler, imported when
+# run so that missing optional dependencies only affect their samplers
+SAMPLERS = {
+    "louvain": ("Qommunity.samplers.regular.louvain_sampler", "LouvainSampler", {}),
+    "leiden": ("Qommunity.samplers.regular.leiden_sampler", "LeidenSampler", {}),
+    "bayan": (
+        "Qommunity.samplers.regular.bayan_sampler",
+        "BayanSampler",
+        {"time_allowed": 60},
+    ),
+    "gurobi": ("Qommunity.samplers.hierarchical.gurobi_sampler", "GurobiSampler", {}),
+    "spectral": (
+        "Qommunity.samplers.hierarchical.spectral_sampler",
+        "SpectralSampler",
+        {},
+    ),
+    "local_sa": ("Qommunity.samplers.hierarchical.local_sampler", "LocalSampler", {}),
+    "local_tabu": (
+        "Qommunity.samplers.hierarchical.local_sampler",
+        "LocalSampler",
+        # Timeout in milliseconds per read, the dwave-samplers default is 100
+        {"method": "tabu", "num_reads": 10, "timeout": 5},
+    ),
+    "tempering": (
+        "Qommunity.samplers.hierarchical.tempering_sampler",
+        "TemperingSampler",
+        {},
+    ),
+}
+
+EXACT_SAMPLERS = ("gurobi", "bayan")
+
+# Methods of the samplers calling their solvers
+SOLVER_METHODS = ("sample_qubo_to_labels", "sample_qubo_to_dict", "sample_qubo_to_list")
+
+
+class SolverClock:
+    """
+    Time spent in the solver methods of a sampler. Methods calling one
+    another (e.g. ``sample_qubo_to_labels`` through ``sample_qubo_to_dict``)
+    are counted once.
+    """
+
+    def __init__(self, sampler) -> None:
+        self.seconds = 0.0
+        self._depth = 0
+        for name in SOLVER_METHODS:
+            method = getattr(sampler, name, None)
+            if method is not None:
+                setattr(sampler, name, self._timed(method))
+
+    def _timed(self, method):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            self._depth += 1
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._depth -= 1
+                if not self._depth:
+                    self.seconds += perf_counter() - start
+
+        return timed
+
+
+def make_sampler(name: str, G: nx.Graph, resolution: float, seed: int | None):
+    module, cls, kwargs = SAMPLERS[name]
+    sampler_class = getattr(import_module(module), cls)
+    if seed is not None and "seed" in inspect.signature(sampler_class).parameters:
+        kwargs = {**kwargs, "seed": seed}
+    return sampler_class(G, resolution=resolution, **kwargs)
+
+
+def shootout(
+    samplers: list[str] | None = None,
+    families: list[str] | None = None,
+    sizes: tuple[int, ...] = (100, 400),
+    resolutions: tuple[float, ...] = (1,),
+    num_runs: int = 3,
+    seed: int | None = 0,
+) -> list[dict]:
+    """
+    Rows (dicts of ``FIELDS``) of ``num_runs`` runs of every sampler on
+    every graph of the grid, all but the exact samplers by default. Graphs
+    depend on ``seed`` and their size only, runs are seeded by
+    ``IterativeSearcher`` (see ``run_seed``).
+    """
+    samplers = samplers or [name for name in SAMPLERS if name not in EXACT_SAMPLERS]
+    families = families or list(FAMILIES)
+    for name in samplers:
+        if name not in SAMPLERS:
+            raise ValueError(
+                f"Unsupported sampler: {name}. "
+                f"The supported samplers are: {', '.join(SAMPLERS)}."
+            )
+    for family in families:
+        if family not in FAMILIES:
+            raise ValueError(
+                f"Unsupported family: {family}. "
+                f"The supported families are: {', '.join(FAMILIES)}."
+            )
+
+    rows = []
+    for family in families:
+        for size in sizes:
+            G = FAMILIES[family](size, seed)
+            for resolution in resolutions:
+                cell = {"family": family, "size": size, "resolution": resolution}
+                for name in samplers:
+                    rows.extend(
+                        _run_sampler(name, G, resolution, num_runs, seed, cell)
+                    )
+    return rows
+
+
+def _run_sampler(
+    name: str,
+    G: nx.Graph,
+    resolution: float,
+    num_runs: int,
+    seed: int | None,
+    cell: dict,
+) -> list[dict]:
+    cell = {**cell, "sampler": name}
+    rows = []
+    try:
+        sampler = make_sampler(name, G, resolution, seed)
+        clock = SolverClock(sampler)
+        searcher = IterativeSearcher(sampler)
+        # Runs one at a time, in this process, to read the clock after each
+        for run, (result, elapsed) in iterate_runs(
+            searcher, "_search_run", num_runs, 1, seed, {}
+        ):
+            rows.append(
+                {
+                    **cell,
+                    "run": run,
+                    "wall_time": elapsed,
+                    "solver_time": clock.seconds,
+                    "modularity": searcher.searcher.modularity(result),
+                    "communities": len(result),
+                    "error": "",
+                }
+            )
+            clock.seconds = 0.0
+    except Exception as e:
+        rows.append({**cell, "error": f"{type(e).__name__}: {e}"})
+    return rows
+
+
+def pareto_front(rows: list[dict]) -> list[dict]:
+    """
+    Mean wall time and modularity of every sampler on every graph, keeping
+    the samplers no other sampler is both faster and better than.
+    """
+    groups = {}
+    for row in rows:
+        if not row.get("error"):
+            key = (row["family"], row["size"], row["resolution"], row["sampler"])
+            groups.setdefault(key, []).append(row)
+
+    means = [
+        {
+            "family": family,
+            "size": size,
+            "resolution": resolution,
+            "sampler": sampler,
+            "wall_time": float(np.mean([r["wall_time"] for r in group])),
+            "modularity": float(np.mean([r["modularity"] for r in group])),
+        }
+        for (family, size, resolution, sampler), group in groups.items()
+    ]
+
+    def graph(mean):
+        return mean["family"], mean["size"], mean["resolution"]
+
+    return [
+        mean
+        for mean in means
+        if not any(
+            graph(other) == graph(mean)
+            and other["wall_time"] <= mean["wall_time"]
+            and other["modularity"] >= mean["modularity"]
+            and (other["wall_time"], other["modularity"])
+            != (mean["wall_time"], mean["modularity"])
+            for other in means
+        )
+    ]
+
+
+def fastest(rows: list[dict], target: float) -> dict[tuple, dict]:
+    """
+    Fastest sampler of every graph (by ``(family, size, resolution)``)
+    whose mean modularity reaches ``target`` times the best mean modularity.
+    """
+    best = {}
+    for mean in pareto_front(rows):
+        key = (mean["family"], mean["size"], mean["resolution"])
+        best.setdefault(key, []).append(mean)
+
+    chosen = {}
+    for key, means in best.items():
+        threshold = target * max(mean["modularity"] for mean in means)
+        chosen[key] = min(
+            (mean for mean in means if mean["modularity"] >= threshold),
+            key=lambda mean: mean["wall_time"],
+        )
+    return chosen
+
+
+def write_csv(rows: list[dict], file) -> None:
+    writer = csv.DictWriter(file, fieldnames=FIELDS, restval="")
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-s", dest="samplers", action="append", choices=SAMPLERS)
+    parser.add_argument("-f", dest="families", action="append", choices=FAMILIES)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 400])
+    parser.add_argument("--resolutions", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", type=float, help="fraction of the best modularity")
+    parser.add_argument("-o", dest="output", help="CSV file, stdout by default")
+    args = parser.parse_args(argv)
+
+    rows = shootout(
+        args.samplers,
+        args.families,
+        tuple(args.sizes),
+        tuple(args.resolutions),
+        args.runs,
+        args.seed,
+    )
+    if args.output:
+        with open(args.output, "w", newline="") as file:
+            write_csv(rows, file)
+    else:
+        write_csv(rows, sys.stdout)
+
+    if args.target is not None:
+        for (family, size, resolution), mean in fastest(rows, args.target).items():
+            print(
+                f"{family} n={size} resolution={resolution}: {mean['sampler']} "
+                f"({mean['wall_time']:.3g} s, modularity {mean['modularity']:.4f})",
+                file=sys.stderr,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
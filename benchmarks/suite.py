@@ -0,0 +1,286 @@
+"""
+Micro-benchmarks of the hot paths of Qommunity and dendro, on synthetic
+graphs of increasing size. Every case is timed (best of ``repeat`` timeit
+runs, per call) and its peak memory traced (tracemalloc, one call), and
+the results are compared with a stored baseline to catch regressions.
+
+    python -m benchmarks.suite                      # compare with baseline.json
+    python -m benchmarks.suite --save               # store a new baseline
+    python -m benchmarks.suite -k modularity -k split --quick
+
+The committed baseline.json is only valid on the machine that recorded
+it (its ``machine`` entry) - store one with ``--save`` before comparing
+on another. The exit status is 1 when a case is slower (or allocates
+more) than its baseline beyond the tolerances.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+
+from Qommunity.samplers.graph_index import GraphIndex
+from Qommunity.samplers.hierarchical.spectral_sampler import SpectralSampler
+from Qommunity.samplers.utils import (
+    SampleDecoder,
+    communities_to_dict,
+    communities_to_list,
+    sample_to_labels,
+)
+from Qommunity.searchers.hierarchical_searcher import (
+    DivisionTree,
+    HierarchicalSearcher,
+)
+from .dendrogram_draw import dendrogram
+
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+TIME_TOLERANCE = 1.5
+MEMORY_TOLERANCE = 1.2
+# Peaks below this many bytes are noise of the allocator
+MEMORY_SLACK = 64 * 1024
+# Slowdowns below this many seconds are noise of the scheduler
+TIME_SLACK = 2e-3
+
+CASES = {}
+
+
+def case(name: str, sizes: tuple[int, ...], quick: tuple[int, ...] = ()):
+    """
+    Register ``setup(size)`` returning the function to be benchmarked,
+    called without arguments. ``quick`` sizes are run with ``--quick``.
+    """
+
+    def register(setup):
+        CASES[name] = (setup, sizes, quick or sizes[:1])
+        return setup
+
+    return register
+
+
+def _graph(number_of_nodes: int, clique_size: int = 8) -> nx.Graph:
+    return nx.ring_of_cliques(number_of_nodes // clique_size, clique_size)
+
+
+def _labels(number_of_nodes: int, communities: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(communities, size=number_of_nodes)
+
+
+@case("split_sample", (1024, 16384, 262144), quick=(1024,))
+def split_sample(size: int):
+    searcher = HierarchicalSearcher(SpectralSampler(_graph(16)))
+    community = list(range(size))
+    labels = _labels(size, 2).astype(np.int8)
+    return lambda: searcher._split_sample(labels, community)
+
+
+@case("communities_to_list", (1024, 16384, 262144), quick=(1024,))
+def bench_communities_to_list(size: int):
+    sample = dict(enumerate(_labels(size, 16).tolist()))
+    return lambda: communities_to_list(sample, 16)
+
+
+@case("communities_to_dict", (1024, 16384, 262144), quick=(1024,))
+def bench_communities_to_dict(size: int):
+    communities = communities_to_list(dict(enumerate(_labels(size, 16).tolist())), 16)
+    return lambda: communities_to_dict(communities)
+
+
+@case("modularity", (1024, 16384, 131072), quick=(1024,))
+def modularity(size: int):
+    index = GraphIndex(_graph(size))
+    labels = np.arange(size) // 8
+    return lambda: index.modularity(labels)
+
+
+@case("batch_modularity", (1024, 16384), quick=(1024,))
+def batch_modularity(size: int):
+    index = GraphIndex(_graph(size))
+    labels = np.stack([_labels(size, 32, seed) for seed in range(32)])
+    return lambda: index.batch_modularity(labels)
+
+
+@case("division_tree", (1024, 16384, 131072), quick=(1024,))
+def division_tree(size: int):
+    # Post-processing of a search bisecting down to single nodes: levels,
+    # modularities of the levels and the linkage matrix
+    tree = DivisionTree(list(range(size)))
+    pending = [(0, list(range(size)))]
+    while pending:
+        cluster, community = pending.pop()
+        if len(community) < 2:
+            tree.mark_indivisible(cluster)
+            continue
+        half = len(community) // 2
+        c0, c1 = community[:half], community[half:]
+        for child, nodes in zip(tree.split(cluster, c0, c1, 1 / size), (c0, c1)):
+            pending.append((child, nodes))
+
+    def post_process():
+        tree.to_levels()
+        tree.level_gains()
+        tree.linkage()
+
+    return post_process
+
+
+@case("sample_to_labels", (1024, 16384, 131072), quick=(1024,))
+def bench_sample_to_labels(size: int):
+    community = list(range(size))
+    sample = {f"x{node}": int(label) for node, label in enumerate(_labels(size, 2))}
+    return lambda: sample_to_labels(sample, community)
+
+
+@case("sample_decoder", (1024, 16384), quick=(1024,))
+def sample_decoder(size: int):
+    # A record of solver samples with shuffled columns, as returned by QHyper
+    community = list(range(size))
+    names = [f"x{node}" for node in np.random.default_rng(0).permutation(size)]
+    probabilities = np.zeros(4, dtype=[(name, np.int8) for name in names])
+    decoder = SampleDecoder(community)
+    decoder.decode(probabilities)
+    return lambda: decoder.decode(probabilities)
+
+
+@case("dendrogram_draw", (64, 256, 1024), quick=(64,))
+def dendrogram_draw(size: int):
+    dendro = dendrogram(size)
+
+    def draw():
+        dendro.draw(show_plot=False, tight_layout=False)
+        dendro.R["fig"].canvas.draw()
+        plt.close(dendro.R["fig"])
+
+    return draw
+
+
+@case("dendrogram_draw_lastp", (1024, 4096), quick=(1024,))
+def dendrogram_draw_lastp(size: int):
+    dendro = dendrogram(size)
+
+    def draw():
+        dendro.draw(show_plot=False, tight_layout=False, truncate_mode="lastp")
+        dendro.R["fig"].canvas.draw()
+        plt.close(dendro.R["fig"])
+
+    return draw
+
+
+def measure(function, repeat: int = 5) -> dict:
+    """Seconds per call (best of ``repeat``) and peak bytes of one call."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_bytes": peak}
+
+
+def run(
+    patterns: list[str] | None = None, quick: bool = False, repeat: int = 5
+) -> dict[str, dict]:
+    """Results of the cases matching any of ``patterns``, by ``name[size]``."""
+    results = {}
+    for name, (setup, sizes, quick_sizes) in CASES.items():
+        if patterns and not any(pattern in name for pattern in patterns):
+            continue
+        for size in quick_sizes if quick else sizes:
+            results[f"{name}[{size}]"] = measure(setup(size), repeat)
+    return results
+
+
+def compare(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    time_tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+) -> list[str]:
+    """Regressions of ``results`` with respect to ``baseline``."""
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        seconds, peak = baseline[key]["seconds"], baseline[key]["peak_bytes"]
+        if result["seconds"] > max(seconds * time_tolerance, seconds + TIME_SLACK):
+            regressions.append(
+                f"{key}: {result['seconds']:.3g} s, baseline {seconds:.3g} s"
+            )
+        if result["peak_bytes"] > max(peak * memory_tolerance, peak + MEMORY_SLACK):
+            regressions.append(
+                f"{key}: {result['peak_bytes']} B peak, baseline {peak} B"
+            )
+    return regressions
+
+
+def load_baseline(path: str = BASELINE) -> dict[str, dict]:
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def save_baseline(results: dict[str, dict], path: str = BASELINE) -> None:
+    # Results of cases not run are kept
+    previous = load_baseline(path) if os.path.exists(path) else {}
+    document = {
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "matplotlib": matplotlib.__version__,
+            "processor": platform.processor() or platform.machine(),
+        },
+        "results": {**previous, **results},
+    }
+    with open(path, "w") as file:
+        json.dump(document, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-k", dest="patterns", action="append", help="cases to run")
+    parser.add_argument("--quick", action="store_true", help="smallest sizes only")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store as the baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.patterns, args.quick, args.repeat)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        baseline = load_baseline(args.baseline)
+
+    print(f"{'case':<32} {'time [ms]':>11} {'peak [KiB]':>11} {'vs baseline':>12}")
+    for key, result in results.items():
+        ratio = ""
+        if key in baseline:
+            ratio = f"{result['seconds'] / baseline[key]['seconds']:.2f}x"
+        print(
+            f"{key:<32} {result['seconds'] * 1e3:>11.3f} "
+            f"{result['peak_bytes'] / 1024:>11.1f} {ratio:>12}"
+        )
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        return 0
+
+    regressions = compare(results, baseline)
+    for regression in regressions:
+        print("Regression:", regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
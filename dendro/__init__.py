@@ -1 +1,2 @@
 from .dendro import Dendrogram
+from .batch import export_dendrograms, render_dendrogram
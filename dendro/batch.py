@@ -0,0 +1,155 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import os
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import networkx as nx
+import numpy as np
+
+from .dendro import Dendrogram
+
+
+FORMATS = ("png", "svg", "pdf")
+
+_process_export = None
+
+
+def render_dendrogram(
+    G: nx.Graph,
+    communities: list[list],
+    division_tree: list[list[list]],
+    division_modularities: list[float],
+    paths: list[str],
+    horizontal: bool = False,
+    dpi: float | None = None,
+    **draw_kwargs,
+) -> list[str]:
+    """
+    Draw a dendrogram on an Agg canvas of its own, outside of pyplot, and
+    save it to every path in ``paths`` (the format follows the extension).
+    Further keyword arguments are passed to ``Dendrogram.draw`` or
+    ``Dendrogram.draw_horizontal``.
+    """
+    dendrogram = Dendrogram(G, communities, division_modularities, division_tree)
+
+    figsize = draw_kwargs.pop("figsize", None)
+    if figsize is None:
+        # Scaled by the number of leafs displayed, fewer when truncated
+        layout = dendrogram.layout(
+            draw_kwargs.get("yaxis_abs_log", False),
+            draw_kwargs.get("truncate_mode"),
+            draw_kwargs.get("p", 30),
+        )
+        figsize = dendrogram._determine_figsize({}, len(layout.leaf_positions))
+        if horizontal:
+            figsize = figsize[::-1]
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    draw = dendrogram.draw_horizontal if horizontal else dendrogram.draw
+    draw(ax=ax, fig=fig, show_plot=False, **draw_kwargs)
+    for path in paths:
+        fig.savefig(path, dpi=dpi)
+
+    # Without pyplot nothing else refers to the figure
+    fig.clear()
+    return paths
+
+
+def _init_process_export(G: nx.Graph, options: dict) -> None:
+    global _process_export
+    _process_export = (G, options)
+
+
+def _export_in_process(run: int, row: tuple, paths: list[str]) -> tuple[int, list]:
+    G, options = _process_export
+    return run, render_dendrogram(G, *row, paths, **options)
+
+
+def export_dendrograms(
+    G: nx.Graph,
+    sampleset: np.recarray,
+    output_dir: str,
+    formats: tuple[str, ...] = ("png",),
+    runs: list[int] | None = None,
+    workers: int | None = None,
+    prefix: str = "dendrogram",
+    horizontal: bool = False,
+    dpi: float | None = None,
+    **draw_kwargs,
+) -> dict[int, list[str]]:
+    """
+    Export the dendrograms of the runs of a sampleset, as returned by
+    ``IterativeHierarchicalSearcher.run_with_sampleset_info`` or read by
+    ``load_sampleset``, to ``{output_dir}/{prefix}_{run}.{format}``.
+
+    Figures are rendered with the Agg backend, without pyplot, by a pool
+    of ``workers`` processes (defaults to the number of CPUs, one renders
+    in the calling process). At most twice as many runs as workers are
+    pending at a time and every figure is released once saved, so memory
+    does not grow with the number of runs.
+
+    Args:
+        runs (list[int] | None, optional): runs to export, all by default.
+        **draw_kwargs: passed to ``Dendrogram.draw`` (or ``draw_horizontal``),
+            e.g. ``color_seed``, ``display_leafs`` or ``figsize``.
+
+    Returns:
+        dict[int, list[str]]: the paths written for every run.
+    """
+    unsupported = set(formats) - set(FORMATS)
+    if unsupported:
+        raise ValueError(
+            f"Unsupported formats: {', '.join(sorted(unsupported))}. "
+            f"The supported formats are: {', '.join(FORMATS)}."
+        )
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be equal or greater than one")
+    workers = workers if workers else os.cpu_count() or 1
+
+    os.makedirs(output_dir, exist_ok=True)
+    if runs is None:
+        runs = range(len(sampleset))
+    options = {"horizontal": horizontal, "dpi": dpi, **draw_kwargs}
+
+    def tasks():
+        for run in runs:
+            record = sampleset[run]
+            row = (
+                list(record["communities"]),
+                record["division_tree"],
+                record["division_modularities"],
+            )
+            paths = [
+                os.path.join(output_dir, f"{prefix}_{run}.{extension}")
+                for extension in formats
+            ]
+            yield run, row, paths
+
+    exported = {}
+    if workers == 1:
+        for run, row, paths in tasks():
+            exported[run] = render_dendrogram(G, *row, paths, **options)
+        return exported
+
+    pending = tasks()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_process_export,
+        initargs=(G, options),
+    ) as executor:
+        running = set()
+        while True:
+            for task in pending:
+                running.add(executor.submit(_export_in_process, *task))
+                if len(running) >= 2 * workers:
+                    break
+            if not running:
+                break
+
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                run, paths = future.result()
+                exported[run] = paths
+
+    return {run: exported[run] for run in runs}
@@ -1,16 +1,17 @@
 from typing import Any
 import warnings
 import matplotlib.axes
-from matplotlib.colors import ListedColormap
+from matplotlib.collections import LineCollection
+from matplotlib.colors import ListedColormap, to_rgba, to_rgba_array
 import matplotlib.figure
 import networkx as nx
 import numpy as np
 import matplotlib 
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
-import math
 import seaborn as sns
 
+from .layout import DendrogramLayout
 from .utils import nodes_to_communities, autoscale_fig_width, get_colorlist
 from .dendro_config import (
     CLUSTER_HLINES,
@@ -88,24 +89,12 @@ class Dendrogram:
             Y_levels: list[float] - to be marked on Y axis.
             mod_increments: list[float] - the increment in modularity each recursive split has provided
         """
-        division_modularities = self.division_modularities
-
-        # Modularity increments
-        mod_increments = [
-            division_modularities[i + 1] - division_modularities[i]
-            for i in range(0, len(division_modularities) - 1)
-        ]
-
-        # Apply abs of natural logarithmic transform
-        if yaxis_abs_log:
-            mod_increments = [abs(math.log(mi)) for mi in mod_increments]
-
-        # Y axis markers
-        Y_levels = list(
-            reversed(
-                [sum(mod_increments[-i - 1 :]) for i, _ in enumerate(mod_increments)]
-            )
-        )
+        # Y levels do not depend on the truncation of the layout, drawings
+        # read them from the layout they draw
+        layout = self.R.get("layout")
+        if layout is None or layout.yaxis_abs_log != yaxis_abs_log:
+            layout = self.layout(yaxis_abs_log)
+        Y_levels, mod_increments = layout.Y_levels, layout.mod_increments
 
         self.R["Y_levels"] = Y_levels
         self.R["yaxis_abs_log"] = yaxis_abs_log
@@ -113,6 +102,35 @@ class Dendrogram:
 
         return Y_levels, mod_increments
 
+    def layout(
+        self,
+        yaxis_abs_log: bool = False,
+        truncate_mode: str | None = None,
+        p: int = 30,
+    ) -> DendrogramLayout:
+        """
+        Coordinates of the dendrogram, see ``DendrogramLayout``. Computed
+        once and cached in ``R["layout"]``, both orientations are drawn
+        from the same layout.
+        """
+        layout = self.R.get("layout")
+        if layout is None or (layout.yaxis_abs_log, layout.truncate_mode, layout.p) != (
+            yaxis_abs_log,
+            truncate_mode,
+            p,
+        ):
+            layout = DendrogramLayout(
+                list(self.G.nodes),
+                self.communities,
+                self.division_tree,
+                self.division_modularities,
+                yaxis_abs_log=yaxis_abs_log,
+                truncate_mode=truncate_mode,
+                p=p,
+            )
+            self.R["layout"] = layout
+        return layout
+
     def draw(
         self,
         display_leafs: bool = True,
@@ -132,6 +150,8 @@ class Dendrogram:
         figsize: tuple | None = None,
         decimal_precision: int = 4,
         tight_layout: bool = True,
+        truncate_mode: str | None = None,
+        p: int = 30,
         **kwargs,
     ):
         """
@@ -244,7 +264,29 @@ class Dendrogram:
 
             tight_layout (bool, optional):
                 Apply tight layout to the plot. Defaults to True.
+
+            truncate_mode (str | None, optional):
+                Collapse the subtrees below a level of the division tree into
+                clades, as SciPy's ``dendrogram``, so that the cost of drawing
+                depends on the number of clades instead of nodes.
+
+                ``None``
+                Draw the whole tree (default).
+
+                ``"lastp"``
+                Cut at the deepest level of at most ``p`` clusters, ``p``
+                being at least 2 (the first split).
+
+                ``"level"``
+                Cut at the level ``p`` (the whole graph being level 0).
+
+                Clades are marked with their sizes, as ``(size)``, or with
+                their node if single. The legend of communities is not shown.
+
+            p (int, optional):
+                Parameter of ``truncate_mode``. Defaults to 30.
         """
+        layout = self.layout(yaxis_abs_log, truncate_mode, p)
         Y_levels, _ = self._calculate_Y_levels(yaxis_abs_log)
 
         # Color maps (cmap)
@@ -258,12 +300,8 @@ class Dendrogram:
         if cmap:
             colors, cluster_colors = self._get_colormap(cmap)
 
-        # Define the mapping between nodes and their position on the plot
+        # Nodes and their positions on the plot
         nodes = np.array(self.G.nodes)
-        leafs_clustering_ordering = [c for cluster in self.communities for c in cluster]
-        node_positions = {
-            leaf: node for node, leaf in zip(nodes, leafs_clustering_ordering)
-        }
 
         if ax and fig and figsize:
             warnings.warn("`ax` and `fig` and `figsize` are specified,"
@@ -271,44 +309,56 @@ class Dendrogram:
         elif figsize:
             fig, ax = plt.subplots(figsize=figsize)
         else:
-            fig, ax = self._get_ax_fig(ax, fig, kwargs, horizontal=False)
+            fig, ax = self._get_ax_fig(
+                ax, fig, kwargs, horizontal=False, leafs=len(layout.leaf_positions)
+            )
 
         # Plot the base
         self._draw_tree_base(
             ax=ax,
             display_leafs=display_leafs,
-            Y_levels=Y_levels,
-            node_positions=node_positions,
-            cluster_colors=cluster_colors,
+            layout=layout,
+            colors=colors,
         )
         # Mark modularity increments at the right side of the plot
         self._mark_modularity_increments(
             ax,
             Y_levels,
-            nodes,
+            layout.leaf_positions,
             with_respect_to_yaxis_abs_log=Y_AXIS_WITH_RESPECT_TO_ABS_LOG,
             round_decimals=decimal_precision,
         )
 
         xlabel_rot_angle = xlabel_rotation if xlabel_rotation else 0
 
+        # Draw clades of the truncated tree
+        if layout.truncated and with_labels:
+            self._set_clades_as_labels(
+                ax=ax,
+                layout=layout,
+                colors=colors,
+                node_labels_mapping=node_labels_mapping,
+                rotation=xlabel_rot_angle,
+                horizontal=False,
+            )
+
         # Draw leafs
-        if display_leafs:
+        elif display_leafs and not layout.truncated:
             ax.set_xticks(nodes)  # Show ticks
             self._set_leafs_as_xlabels(
                 ax=ax,
-                leafs_clustering_ordering=leafs_clustering_ordering,
+                leafs_clustering_ordering=layout.leafs_ordering.tolist(),
                 node_labels_mapping=node_labels_mapping,
                 cluster_colors=cluster_colors,
                 xlabel_rot=xlabel_rot_angle,
             )
 
         # Draw communities with labels
-        elif with_labels:
+        elif with_labels and not layout.truncated:
             ax.set_xticks([])  # Hide ticks
             self._set_communities_as_xlabels(
                 ax=ax,
-                node_positions=node_positions,
+                layout=layout,
                 communities_labels=communities_labels,
                 cluster_colors=cluster_colors,
                 xlabel_rot=xlabel_rot_angle,
@@ -358,7 +408,7 @@ class Dendrogram:
         # Hide plot box borders (spines)
         ax.spines["top"].set_visible(False)
         ax.spines["right"].set_visible(False)
-        if not display_leafs:
+        if not (display_leafs or layout.truncated):
             ax.spines["bottom"].set_visible(False)
             ax.xaxis.set_visible(False)
         ax.spines["left"].set_visible(True)
@@ -369,7 +419,7 @@ class Dendrogram:
         self._set_yaxis_label(kwargs, ax)
 
         if tight_layout:
-            plt.tight_layout()
+            fig.tight_layout()
 
         if fig_saving_path:
             try:
@@ -407,6 +457,8 @@ class Dendrogram:
         figsize: tuple | None = None,
         decimal_precision: int = 4,
         tight_layout: bool = True,
+        truncate_mode: str | None = None,
+        p: int = 30,
         **kwargs,
     ):
         """
@@ -485,7 +537,29 @@ class Dendrogram:
 
             tight_layout (bool, optional):
                 Apply tight layout to the plot. Defaults to True.
+
+            truncate_mode (str | None, optional):
+                Collapse the subtrees below a level of the division tree into
+                clades, as SciPy's ``dendrogram``, so that the cost of drawing
+                depends on the number of clades instead of nodes.
+
+                ``None``
+                Draw the whole tree (default).
+
+                ``"lastp"``
+                Cut at the deepest level of at most ``p`` clusters, ``p``
+                being at least 2 (the first split).
+
+                ``"level"``
+                Cut at the level ``p`` (the whole graph being level 0).
+
+                Clades are marked with their sizes, as ``(size)``, or with
+                their node if single. The legend of communities is not shown.
+
+            p (int, optional):
+                Parameter of ``truncate_mode``. Defaults to 30.
         """
+        layout = self.layout(yaxis_abs_log, truncate_mode, p)
         Y_levels, _ = self._calculate_Y_levels(yaxis_abs_log)
 
         # Color maps (cmap)
@@ -493,19 +567,15 @@ class Dendrogram:
             self._set_random_colors_with_seed(color_seed)
 
         # Default color options
+        colors = self._cluster_colors_list
         cluster_colors = self._cluster_colors_dict
 
         if cmap:
-            _, cluster_colors = self._get_colormap(cmap)
+            colors, cluster_colors = self._get_colormap(cmap)
 
         # Orders in which leafs (nodes) appear in the final clustering
         # for dendrogram readability/esthetics purposes
         nodes = np.array(self.G.nodes)
-        # Dict of pairs (leaf - order in final clustering, initial node number)
-        leafs_clustering_ordering = [c for cluster in self.communities for c in cluster]
-        node_positions = {
-            leaf: node for node, leaf in zip(nodes, leafs_clustering_ordering)
-        }
 
         if ax and fig and figsize:
             warnings.warn("`ax` and `fig` and `figsize` are specified,"
@@ -514,7 +584,9 @@ class Dendrogram:
         if figsize:
             fig, ax = plt.subplots(figsize=figsize)
         else:
-            fig, ax = self._get_ax_fig(ax, fig, kwargs, horizontal=True)
+            fig, ax = self._get_ax_fig(
+                ax, fig, kwargs, horizontal=True, leafs=len(layout.leaf_positions)
+            )
 
         # Invert axes
         ax.invert_yaxis()
@@ -524,9 +596,8 @@ class Dendrogram:
         # Plot the base
         self._draw_tree_base_horizontal(
             ax=ax,
-            Y_levels=Y_levels,
-            node_positions=node_positions,
-            cluster_colors=cluster_colors,
+            layout=layout,
+            colors=colors,
         )
 
         ylabel_rot_angle = ylabel_rotation if ylabel_rotation else 0
@@ -535,15 +606,25 @@ class Dendrogram:
         self._set_yaxis_label_inverted(kwargs, ax)
         self._set_xaxis_label_inverted(kwargs, ax)
 
-        # Leafs go to Y axis
-        ax.set_yticks(nodes)
-        self._set_leafs_as_ylabels(
-            ax=ax,
-            leafs_clustering_ordering=leafs_clustering_ordering,
-            node_labels_mapping=node_labels_mapping,
-            cluster_colors=cluster_colors,
-            ylabel_rot=ylabel_rot_angle,
-        )
+        # Leafs (or clades of the truncated tree) go to Y axis
+        if layout.truncated:
+            self._set_clades_as_labels(
+                ax=ax,
+                layout=layout,
+                colors=colors,
+                node_labels_mapping=node_labels_mapping,
+                rotation=ylabel_rot_angle,
+                horizontal=True,
+            )
+        else:
+            ax.set_yticks(nodes)
+            self._set_leafs_as_ylabels(
+                ax=ax,
+                leafs_clustering_ordering=layout.leafs_ordering.tolist(),
+                node_labels_mapping=node_labels_mapping,
+                cluster_colors=cluster_colors,
+                ylabel_rot=ylabel_rot_angle,
+            )
 
         # Set modularity ticks on X axis
         ax.set_xticks(np.sort(np.array([0] + Y_levels)))
@@ -566,7 +647,7 @@ class Dendrogram:
         ax.spines["left"].set_visible(True)
 
         if tight_layout:
-            plt.tight_layout()
+            fig.tight_layout()
 
         if fig_saving_path:
             try:
@@ -592,323 +673,151 @@ class Dendrogram:
         self,
         ax: matplotlib.axes.Axes,
         display_leafs: bool,
-        Y_levels: list[float],
-        node_positions: dict[int, int],
-        cluster_colors: dict[int, tuple],
+        layout: DendrogramLayout,
+        colors: list,
         **kwargs,
     ):
-        division_tree = self.division_tree
-
         # Get esthetics settings
-        vline_color = TREE_BASE_STYLE["vline_color"]
-        hline_color = TREE_BASE_STYLE["hline_color"]
-        hier_line_alpha = TREE_BASE_STYLE["hier_line_alpha"]
-
         leafs_scatter_settings = LEAFS_SETTINGS["LEAFS_SCATTER"]
         leafs_hlines_settings = LEAFS_SETTINGS["LEAFS_HLINES"]
 
-        horizontal_coords = {}
-        # Traverse the division tree bottom->up
-        for level in reversed(range(len(division_tree))):
-            level_clustering = division_tree[level]
-
-            # CASE OF FINAL CLUSTERING (LEAFS):
-            # For every cluster in the final clustering:
-            #   For every leaf in a cluster:
-            #       1. scatter it
-            #   2. then draw one horizontal line for visually agglomerating a cluster
-            if level == len(division_tree) - 1:
-                for cluster in level_clustering:
-                    cluster_leafs_positioned = [
-                        node_positions[node] for node in cluster
-                    ]
-
-                    base_modularity_zero = self.division_modularities[0]
-
-                    # x (horizontal) corrds of the cluster - to know where to start and stop drawing
-                    xmin = min(cluster_leafs_positioned)
-                    xmax = max(cluster_leafs_positioned)
-                    xmid = (xmin + xmax) / 2
-
-                    # In the case of final clustering ymin is the ground/base of 0
-                    ymin = base_modularity_zero
-                    ymax = Y_levels[level - 1]
-                    ax.vlines(
-                        x=xmid,
-                        ymin=ymin,
-                        ymax=ymax,
-                        colors=vline_color,
-                        alpha=hier_line_alpha,
-                    )
-                    # Mark x coord mids to know where to simplify plotting the next dendrogram hierarchy level
-                    horizontal_coords[hash(tuple(cluster))] = xmid
-
-                    if display_leafs:
-                        # 1.
-                        for x in cluster_leafs_positioned:
-                            ax.scatter(
-                                x,
-                                base_modularity_zero,
-                                color=cluster_colors[hash(tuple(cluster))],
-                                s=leafs_scatter_settings["s"],
-                                alpha=leafs_scatter_settings["alpha"],
-                            )
-
-                        # 2.
-                        ax.hlines(
-                            y=base_modularity_zero,
-                            xmin=xmin,
-                            xmax=xmax,
-                            colors=cluster_colors[hash(tuple(cluster))],
-                            alpha=leafs_hlines_settings["alpha"],
-                            linewidth=leafs_hlines_settings["linewidth"],
-                        )
-
-                    else:
-                        # 2.
-                        ax.hlines(
-                            y=base_modularity_zero,
-                            xmin=xmin,
-                            xmax=xmax,
-                            colors=cluster_colors[hash(tuple(cluster))],
-                            alpha=CLUSTER_HLINES["alpha"],
-                            linewidth=CLUSTER_HLINES["linewidth"],
-                        )
-
-            # CASE OF NON-FINAL DIVISION TREE LEVELS (CLADES):
-            else:
-                # In a currently considered hierarchy level of the division tree:
-                # A. For each cluster in the clustering of that level:
-                #   1. find subclusters of this cluster (the later division of that cluster),
-                #      called "subsequent clusters" below;
-                #      to know, where to start and end plotting lines (calculate positions);
-                #      paying attention to: the order of the clusters in each level of the division tree
-                #      shall not be taken for granted, hence we do a double "for" loop;
-                #   2. draw appropriate plot elements corresponding to this level of the division tree:
-                #      - vertical line connecting "subsequent" (check glossary below) divisions
-                #        with the current division;
-                #      - horizontal line (Y axis markers) correspondant to that level;
-
-                # B. IMPORTANT: Note that on each hierarchy level of the hierarchical search method
-                # a further division of a given cluster may or may not occur. (A community may
-                # or may not be further divided in later hierarchical search calls.)
-                #
-                # That's why a considered community may have:
-                #   1. only one subcluster ("simplicifolious") - itself
-                #      (in a case of no further divisions),
-                #   2. two subclusters (in the case of further binary division).
-                # The two cases are handled.
-
-                # GLOSSARY:
-                # "Subsequent" - meaning:
-                # one hierarchy level lower (deeper) in the division tree <=> ...
-                # ... <=> one hierarchy level higher in a reversed division tree
-                subsequent_clusters = division_tree[level + 1]
-                subclusters = {}
-
-                # A.1
-                for subsequent_cluster in subsequent_clusters:
-                    for cluster in level_clustering:
-                        if set(subsequent_cluster).issubset(set(cluster)):
-                            key_clus = hash(tuple(cluster))
-                            if key_clus not in subclusters.keys():
-                                subclusters[key_clus] = subsequent_cluster
-                            else:
-                                subclusters[key_clus] = (
-                                    subclusters.get(key_clus),
-                                    subsequent_cluster,
-                                )
-                # A.2
-                for cluster in level_clustering:
-                    y = Y_levels[level]
-                    key_clus = hash(tuple(cluster))
-
-                    # CASE B.2:
-                    # two subcommunities - tuple (of lists)
-                    if type(subclusters[key_clus]) == tuple:
-                        c0, c1 = subclusters[key_clus]
-                        key1, key2 = hash(tuple(c0)), hash(tuple(c1))
-                        # Coords for plotting
-                        if (
-                            key1 in horizontal_coords.keys()
-                            and key2 in horizontal_coords.keys()
-                        ):
-                            mid_c0 = horizontal_coords[key1]
-                            mid_c1 = horizontal_coords[key2]
-                            mid = (mid_c0 + mid_c1) / 2
-                            horizontal_coords[hash(tuple(cluster))] = mid
-
-                            # Draw vertical line for this level
-                            ymin = y
-                            ymax = Y_levels[level - 1]
-                            if level != 0:
-                                ax.vlines(
-                                    x=mid,
-                                    ymin=ymin,
-                                    ymax=ymax,
-                                    colors=vline_color,
-                                    alpha=hier_line_alpha,
-                                )
-
-                        # Connect clusters with horizontal line
-                        ax.hlines(
-                            y=y,
-                            xmin=mid_c0,
-                            xmax=mid_c1,
-                            colors=hline_color,
-                            alpha=hier_line_alpha,
-                        )
-
-                    # CASE B.1:
-                    # only one subcommunity - list
-                    elif type(subclusters[key_clus]) == list and level != 0:
-                        # Draw vertical line for this level
-                        mid_c0 = horizontal_coords[hash(tuple(cluster))]
-                        ymin = y
-                        ymax = Y_levels[level - 1]
-
-                        ax.vlines(
-                            x=mid_c0,
-                            ymin=ymin,
-                            ymax=ymax,
-                            colors=vline_color,
-                            alpha=hier_line_alpha,
-                        )
+        # Clades (vertical lines), their connectors and final clusters
+        # (horizontal lines) are drawn as a single collection, leafs as a
+        # single scatter
+        rgba = self._leafs_rgba(colors)
+        leafs_hlines_style = leafs_hlines_settings if display_leafs else CLUSTER_HLINES
+        self._draw_tree_lines(ax, layout, rgba, leafs_hlines_style)
+        if display_leafs:
+            self._draw_leafs(ax, layout, rgba, leafs_scatter_settings)
 
     def _draw_tree_base_horizontal(
         self,
         ax: matplotlib.axes.Axes,
-        Y_levels: list[float],
-        node_positions: dict[int, int],
-        cluster_colors: dict[int, tuple],
+        layout: DendrogramLayout,
+        colors: list,
         **kwargs,
     ):
-        division_tree = self.division_tree
-
         # Esthetics
-        vline_color = TREE_BASE_STYLE["vline_color"]
-        hline_color = TREE_BASE_STYLE["hline_color"]
-        hier_line_alpha = TREE_BASE_STYLE["hier_line_alpha"]
-
         leafs_scatter_settings = LEAFS_SETTINGS["LEAFS_SCATTER"]
         leafs_vlines_settings = LEAFS_SETTINGS["LEAFS_VLINES"]
 
-        # Store positions of the nodes
-        vertical_coords = {}
-
-        # Iterate the division tree bottom -> up
-        for level in reversed(range(len(division_tree))):
-            level_clustering = division_tree[level]
-
-            if level == len(division_tree) - 1:
-                for i, cluster in enumerate(level_clustering):
-                    cluster_leafs_positioned = [
-                        node_positions[node] for node in cluster
-                    ]
-
-                    base_modularity_zero = self.division_modularities[0]
-
-                    # Adjust coordinates for the rotated plot
-                    ymin = min(cluster_leafs_positioned)
-                    ymax = max(cluster_leafs_positioned)
-                    ymid = (ymin + ymax) / 2
-
-                    xmin = base_modularity_zero
-                    xmax = Y_levels[level - 1]
-
-                    # Change vlines to hlines for horizontal dendrogram
-                    ax.hlines(
-                        y=ymid,
-                        xmin=xmin,
-                        xmax=xmax,
-                        colors=vline_color,
-                        alpha=hier_line_alpha,
-                    )
-
-                    vertical_coords[hash(tuple(cluster))] = ymid
-
-                    for j, y in enumerate(cluster_leafs_positioned):
-                        # Scatter the points (rotate coordinates)
-                        ax.scatter(
-                            base_modularity_zero,
-                            y,
-                            color=cluster_colors[hash(tuple(cluster))],
-                            s=leafs_scatter_settings["s"],
-                            alpha=leafs_scatter_settings["alpha"],
-                        )
-
-                    # Change hlines to vlines
-                    ax.vlines(
-                        x=base_modularity_zero,
-                        ymin=ymin,
-                        ymax=ymax,
-                        colors=cluster_colors[hash(tuple(cluster))],
-                        alpha=leafs_vlines_settings["alpha"],
-                        linewidth=leafs_vlines_settings["linewidth"],
-                    )
+        # The layout of _draw_tree_base with the axes swapped
+        rgba = self._leafs_rgba(colors)
+        self._draw_tree_lines(ax, layout, rgba, leafs_vlines_settings, horizontal=True)
+        self._draw_leafs(ax, layout, rgba, leafs_scatter_settings, horizontal=True)
+
+    def _draw_tree_lines(
+        self,
+        ax: matplotlib.axes.Axes,
+        layout: DendrogramLayout,
+        rgba: np.ndarray,
+        leaf_lines_style: dict,
+        horizontal: bool = False,
+    ) -> LineCollection:
+        # One collection, its lines in the order of a cluster by cluster
+        # rendering - translucent lines overlapping at the base and at the
+        # connectors blend as if drawn one by one
+        segments = layout.segments(horizontal)
+        clades = len(layout.clade_lines) + len(layout.connector_lines)
+        leaf_colors = rgba[layout.leaf_line_communities]
+        leaf_colors[:, 3] = leaf_lines_style["alpha"]
+        tree_color = to_rgba(
+            TREE_BASE_STYLE["vline_color"], TREE_BASE_STYLE["hier_line_alpha"]
+        )
+        connector_color = to_rgba(
+            TREE_BASE_STYLE["hline_color"], TREE_BASE_STYLE["hier_line_alpha"]
+        )
+        colors = np.concatenate(
+            [
+                np.tile(tree_color, (len(layout.clade_lines), 1)),
+                np.tile(connector_color, (len(layout.connector_lines), 1)),
+                leaf_colors,
+            ]
+        )
+        linewidths = np.concatenate(
+            [
+                np.full(clades, matplotlib.rcParams["lines.linewidth"]),
+                np.full(len(leaf_colors), leaf_lines_style["linewidth"]),
+            ]
+        )
+
+        order = layout.drawing_order()
+        lines = LineCollection(
+            np.concatenate(
+                [
+                    segments["clade_lines"],
+                    segments["connector_lines"],
+                    segments["leaf_lines"],
+                ]
+            )[order],
+            colors=colors[order],
+            linewidths=linewidths[order],
+        )
+        ax.add_collection(lines)
+        return lines
+
+    def _draw_leafs(
+        self,
+        ax: matplotlib.axes.Axes,
+        layout: DendrogramLayout,
+        rgba: np.ndarray,
+        leafs_scatter_style: dict,
+        horizontal: bool = False,
+    ) -> None:
+        # One scatter per community, in the order of the final clusters -
+        # markers of a single color are drawn (and snapped to pixels) as
+        # markers of single leafs are
+        points = layout.markers(horizontal)
+        communities = np.concatenate(
+            [layout.leaf_line_communities, layout.leaf_communities]
+        )
+        for community in dict.fromkeys(communities.tolist()):
+            x, y = points[layout.leaf_communities == community].T
+            ax.scatter(
+                x,
+                y,
+                color=rgba[community],
+                s=leafs_scatter_style["s"],
+                alpha=leafs_scatter_style["alpha"],
+            )
+
+    def _leafs_rgba(self, colors: list) -> np.ndarray:
+        # Colors of the communities, clades of the truncated tree spanning
+        # several communities (community -1) take the color of the tree
+        return to_rgba_array([*colors, TREE_BASE_STYLE["vline_color"]])
 
+    def _set_clades_as_labels(
+        self,
+        ax: matplotlib.axes.Axes,
+        layout: DendrogramLayout,
+        colors: list,
+        node_labels_mapping: dict[int, str] | None,
+        rotation: float,
+        horizontal: bool,
+    ):
+        labels = []
+        for size, node in zip(layout.clade_sizes, layout.clade_nodes):
+            if size > 1:
+                labels.append(f"({size})")
+            elif node_labels_mapping:
+                labels.append(str(node_labels_mapping[node]))
             else:
-                subsequent_clusters = division_tree[level + 1]
-                subclusters = {}
-
-                for i, subsequent_cluster in enumerate(subsequent_clusters):
-                    for j, cluster in enumerate(level_clustering):
-                        if set(subsequent_cluster).issubset(set(cluster)):
-                            if j not in subclusters.keys():
-                                subclusters[j] = subsequent_cluster
-                            else:
-                                subclusters[j] = (
-                                    subclusters.get(j),
-                                    subsequent_cluster,
-                                )
-
-                for i, cluster in enumerate(level_clustering):
-                    x = Y_levels[level]
-
-                    if type(subclusters[i]) == tuple:
-                        c0, c1 = subclusters[i]
-                        key1, key2 = hash(tuple(c0)), hash(tuple(c1))
-
-                        if (
-                            key1 in vertical_coords.keys()
-                            and key2 in vertical_coords.keys()
-                        ):
-                            mid_c0 = vertical_coords[key1]
-                            mid_c1 = vertical_coords[key2]
-                            mid = (mid_c0 + mid_c1) / 2
-                            vertical_coords[hash(tuple(cluster))] = mid
-
-                            xmin = x
-                            xmax = Y_levels[level - 1]
-
-                            if level != 0:
-                                ax.hlines(
-                                    y=mid,
-                                    xmin=xmin,
-                                    xmax=xmax,
-                                    colors=vline_color,
-                                    alpha=hier_line_alpha,
-                                )
-
-                        ax.vlines(
-                            x=x,
-                            ymin=mid_c0,
-                            ymax=mid_c1,
-                            colors=hline_color,
-                            alpha=hier_line_alpha,
-                        )
-
-                    elif type(subclusters[i]) == list and level != 0:
-                        mid_c0 = vertical_coords[hash(tuple(cluster))]
-                        xmin = x
-                        xmax = Y_levels[level - 1]
-                        ax.hlines(
-                            y=mid_c0,
-                            xmin=xmin,
-                            xmax=xmax,
-                            colors=vline_color,
-                            alpha=hier_line_alpha,
-                        )
+                labels.append(str(node))
+
+        if horizontal:
+            ax.yaxis.set_ticks_position("left")
+            ax.set_yticks(layout.leaf_positions, labels, rotation=rotation)
+            ticklabels = ax.get_yticklabels()
+        else:
+            ax.xaxis.set_ticks_position("bottom")
+            ax.set_xticks(layout.leaf_positions, labels, rotation=rotation)
+            ticklabels = ax.get_xticklabels()
+
+        # Clades are coloured by their communities
+        rgba = self._leafs_rgba(colors)
+        for label, community in zip(ticklabels, layout.leaf_communities):
+            label.set_color(rgba[community])
+            label.set_fontweight("bold")
 
     def _mark_modularity_increments(
         self,
@@ -1094,14 +1003,13 @@ class Dendrogram:
     def _set_communities_as_xlabels(
         self,
         ax: matplotlib.axes.Axes,
-        node_positions: dict[int, int],
+        layout: DendrogramLayout,
         communities_labels: list,
         cluster_colors: dict[int, tuple],
         xlabel_rot: float,
     ):
         for i, cluster in enumerate(self.communities):
-            cluster_leafs_positioned = [node_positions[node] for node in cluster]
-            xmid = (min(cluster_leafs_positioned) + max(cluster_leafs_positioned)) / 2
+            xmid = layout.community_mids[i]
 
             label = communities_labels[i] if communities_labels else f"{i}"
             ax.text(
@@ -1147,6 +1055,7 @@ class Dendrogram:
         fig: matplotlib.figure.Figure | None,
         kwargs: dict,
         horizontal: bool,
+        leafs: int | None = None,
     ):
         """
         Extract ax and fig if both passed (if both not None). If not, "
@@ -1174,19 +1083,22 @@ class Dendrogram:
         if xor(fig is None, ax is None):
             raise ValueError("ax and fig must be passed both")
 
-        x_width, y_height = self._determine_figsize(kwargs)
+        x_width, y_height = self._determine_figsize(kwargs, leafs)
         if horizontal:
             x_width, y_height = y_height, x_width
         fig, ax = plt.subplots(figsize=(x_width, y_height))
 
         return fig, ax
 
-    def _determine_figsize(self, kwargs: dict):
+    def _determine_figsize(self, kwargs: dict, leafs: int | None = None):
+        # The width follows the number of leafs - the nodes by default
         if "figsize" in kwargs:
             figsize = kwargs.get("figsize", DEFAULT_FIGSIZE)
             x_width, y_height = figsize[0], figsize[1]
         else:
-            x_width = autoscale_fig_width(len(self.G.nodes))
+            if leafs is None:
+                leafs = len(self.G.nodes)
+            x_width = autoscale_fig_width(leafs)
             y_height = DEFAULT_FIG_HEIGHT
 
         return x_width, y_height
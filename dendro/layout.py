@@ -0,0 +1,269 @@
+import math
+import numpy as np
+
+
+TRUNCATE_MODES = ("lastp", "level")
+
+
+class DendrogramLayout:
+    """
+    Coordinates of every element of a dendrogram, computed once from the
+    division tree and the division modularities, independently of the
+    orientation and of matplotlib.
+
+    Coordinates are given along two axes: ``leaf`` - the axis of the leafs
+    (X of the vertical dendrogram), and ``level`` - the axis of the
+    modularity levels (Y of the vertical dendrogram). Lines are stored as
+    ``(k, 3)`` arrays of rows ``(position, start, stop)``:
+
+    - ``clade_lines`` - lines along the level axis, at leaf positions;
+    - ``connector_lines`` - lines along the leaf axis joining the two
+      subclusters of a split, at level positions;
+    - ``leaf_lines`` - lines along the leaf axis spanning the final
+      clusters, at the base level, coloured by ``leaf_line_communities``.
+
+    Leafs (graph nodes) are placed at ``leaf_positions`` in the order of
+    ``leafs_ordering`` (the nodes of the communities, community after
+    community) and belong to the communities ``leaf_communities``.
+
+    With ``truncate_mode`` (as in SciPy's ``dendrogram``) the tree is cut
+    at a level of the division tree - ``"lastp"``: the deepest level of at
+    most ``p >= 2`` clusters, ``"level"``: the level ``p`` (the root is
+    level 0).
+    The clusters of that level become the leafs (``truncated`` is set):
+    one per position, ``clade_sizes`` nodes each, ``clade_nodes`` being
+    their first nodes. Clades within one community belong to it, others
+    to no community (-1). Leaf lines are not drawn for clades.
+    """
+
+    def __init__(
+        self,
+        nodes: list,
+        communities: list[list],
+        division_tree: list[list[list]],
+        division_modularities: list[float],
+        yaxis_abs_log: bool = False,
+        truncate_mode: str | None = None,
+        p: int = 30,
+    ) -> None:
+        if truncate_mode is not None and truncate_mode not in TRUNCATE_MODES:
+            raise ValueError(
+                f"Unsupported truncate_mode: {truncate_mode}. "
+                f"The supported modes are: {', '.join(TRUNCATE_MODES)}."
+            )
+        if p < 1:
+            raise ValueError("p must be equal or greater than one")
+        if truncate_mode == "lastp" and p < 2:
+            # The first split is always shown
+            raise ValueError("p must be equal or greater than two for 'lastp'")
+
+        self.yaxis_abs_log = yaxis_abs_log
+        self.truncate_mode = truncate_mode
+        self.p = p
+        self.base = division_modularities[0]
+
+        mod_increments = [
+            division_modularities[i + 1] - division_modularities[i]
+            for i in range(len(division_modularities) - 1)
+        ]
+        if yaxis_abs_log:
+            mod_increments = [abs(math.log(mi)) for mi in mod_increments]
+        # Increments summed from the bottom of the hierarchy up to each level
+        self.mod_increments = mod_increments
+        self.Y_levels = [sum(mod_increments[i:]) for i in range(len(mod_increments))]
+
+        # Leaf positions - the i-th leaf of the clustering ordering is
+        # placed at the position of the i-th node of the graph
+        self.leafs_ordering = _concatenate(communities)
+        nodes = np.asarray(nodes)
+        size = min(len(nodes), len(self.leafs_ordering))
+        self.leafs_ordering = self.leafs_ordering[:size]
+        self.leaf_positions = nodes[:size]
+        self.leaf_communities = np.repeat(
+            np.arange(len(communities)), [len(c) for c in communities]
+        )[:size]
+
+        number_of_nodes = int(self.leafs_ordering.max()) + 1 if size else 0
+        self._position = np.zeros(number_of_nodes, dtype=self.leaf_positions.dtype)
+        self._position[self.leafs_ordering] = self.leaf_positions
+        self._community = np.full(number_of_nodes, -1, dtype=np.int64)
+        self._community[self.leafs_ordering] = self.leaf_communities
+
+        self.community_mids = self._mids(communities)[2]
+
+        depth = _truncation_level(division_tree, truncate_mode, p)
+        self.truncated = depth < len(division_tree) - 1
+        if self.truncated:
+            division_tree = division_tree[: depth + 1]
+            self._collapse(division_tree[-1])
+
+        self._layout_tree(division_tree)
+        if self.truncated:
+            self.leaf_lines = np.empty((0, 3))
+            self.leaf_line_communities = np.empty(0, dtype=np.int64)
+            self._leaf_keys = np.empty((0, 2), dtype=np.int64)
+
+    def _collapse(self, clades: list[list]) -> None:
+        # Every clade takes a single position, in the order of its leafs
+        rank = np.zeros(len(self._position), dtype=np.int64)
+        rank[self.leafs_ordering] = np.arange(len(self.leafs_ordering))
+        members = _concatenate(clades)
+        sizes = np.array([len(c) for c in clades])
+        starts = np.cumsum(sizes) - sizes
+        order = np.argsort(np.minimum.reduceat(rank[members], starts), kind="stable")
+        positions = np.empty(len(clades), dtype=np.int64)
+        positions[order] = np.arange(len(clades))
+
+        self._position = self._position.astype(np.int64)
+        self._position[members] = np.repeat(positions, sizes)
+
+        community = self._community[members]
+        lowest = np.minimum.reduceat(community, starts)
+        single = lowest == np.maximum.reduceat(community, starts)
+        self.leaf_positions = np.arange(len(clades))
+        self.leaf_communities = np.where(single, lowest, -1)[order]
+        self.clade_sizes = sizes[order]
+        self.clade_nodes = members[starts][order]
+
+    def _mids(self, clusters: list[list]) -> tuple[np.ndarray, ...]:
+        # Minimum, maximum and middle leaf positions of every cluster
+        positions = self._position[_concatenate(clusters)]
+        starts = np.cumsum([0] + [len(c) for c in clusters[:-1]])
+        minimum = np.minimum.reduceat(positions, starts)
+        maximum = np.maximum.reduceat(positions, starts)
+        return minimum, maximum, (minimum + maximum) / 2
+
+    def _layout_tree(self, division_tree: list[list[list]]) -> None:
+        Y_levels = self.Y_levels
+        bottom = len(division_tree) - 1
+        clade_lines, connector_lines = [], []
+        # (level from the bottom, cluster) of every line, see drawing_order
+        clade_keys, connector_keys = [], []
+
+        # Final clustering - clades rise from the base of the leafs
+        final = division_tree[bottom]
+        minimum, maximum, mids = self._mids(final)
+        base = np.full(len(final), self.base)
+        top = np.full(len(final), Y_levels[bottom - 1])
+        clade_lines.append(np.column_stack([mids, base, top]))
+        self.leaf_lines = np.column_stack([base, minimum, maximum])
+        self.leaf_line_communities = self._community[[c[0] for c in final]]
+        clade_keys.append(_keys(0, np.arange(len(final))))
+        self._leaf_keys = _keys(0, np.arange(len(final)))
+
+        # Upper levels - every cluster joins its one or two subclusters
+        for level in reversed(range(bottom)):
+            clusters = division_tree[level]
+            labels = np.full(len(self._position), -1, dtype=np.int64)
+            labels[_concatenate(clusters)] = np.repeat(
+                np.arange(len(clusters)), [len(c) for c in clusters]
+            )
+            parents = labels[[c[0] for c in division_tree[level + 1]]]
+            counts = np.bincount(parents, minlength=len(clusters))
+            if parents.min() < 0 or counts.min() < 1 or counts.max() > 2:
+                raise ValueError("division tree levels are not nested")
+
+            # Subclusters in the order of the subsequent level
+            children = np.arange(len(parents))
+            first = np.empty(len(clusters), dtype=np.int64)
+            last = np.empty(len(clusters), dtype=np.int64)
+            first[parents[::-1]] = children[::-1]
+            last[parents] = children
+            split = counts == 2
+
+            y = Y_levels[level]
+            connector_lines.append(
+                np.column_stack(
+                    [np.full(split.sum(), y), mids[first[split]], mids[last[split]]]
+                )
+            )
+            connector_keys.append(_keys(bottom - level, np.flatnonzero(split)))
+            mids = np.where(split, (mids[first] + mids[last]) / 2, mids[first])
+            if level != 0:
+                top = np.full(len(clusters), Y_levels[level - 1])
+                clade_lines.append(
+                    np.column_stack([mids, np.full(len(clusters), y), top])
+                )
+                clade_keys.append(_keys(bottom - level, np.arange(len(clusters))))
+
+        self.clade_lines = np.concatenate(clade_lines)
+        self._clade_keys = np.concatenate(clade_keys)
+        self.connector_lines = (
+            np.concatenate(connector_lines) if connector_lines else np.empty((0, 3))
+        )
+        self._connector_keys = (
+            np.concatenate(connector_keys)
+            if connector_keys
+            else np.empty((0, 2), dtype=np.int64)
+        )
+
+    def drawing_order(self) -> np.ndarray:
+        """
+        Indices of the lines (``clade_lines``, ``connector_lines`` and
+        ``leaf_lines`` concatenated) in the order of a cluster by cluster
+        rendering: level after level from the bottom up, cluster after
+        cluster, the clade line before the connector or leaf line of its
+        cluster. Overlapping translucent lines blend in this order.
+        """
+        keys = np.concatenate([self._clade_keys, self._connector_keys, self._leaf_keys])
+        # Clade lines first within a cluster
+        second = np.repeat(
+            [0, 1, 1],
+            [len(self._clade_keys), len(self._connector_keys), len(self._leaf_keys)],
+        )
+        return np.lexsort((second, keys[:, 1], keys[:, 0]))
+
+    def segments(self, horizontal: bool = False) -> dict[str, np.ndarray]:
+        """
+        Lines as ``(k, 2, 2)`` arrays of their end points ``(x, y)`` in the
+        coordinates of the given orientation, e.g. for ``LineCollection``
+        or exporters other than matplotlib.
+        """
+        return {
+            "clade_lines": _segments(self.clade_lines, True, horizontal),
+            "connector_lines": _segments(self.connector_lines, False, horizontal),
+            "leaf_lines": _segments(self.leaf_lines, False, horizontal),
+        }
+
+    def markers(self, horizontal: bool = False) -> np.ndarray:
+        """``(n, 2)`` coordinates ``(x, y)`` of the leafs."""
+        points = np.column_stack(
+            [self.leaf_positions, np.full(len(self.leaf_positions), self.base)]
+        )
+        return points[:, ::-1] if horizontal else points
+
+
+def _truncation_level(
+    division_tree: list[list[list]], truncate_mode: str | None, p: int
+) -> int:
+    # Deepest level of the division tree to display
+    bottom = len(division_tree) - 1
+    if truncate_mode == "level":
+        return max(1, min(p, bottom))
+    if truncate_mode == "lastp":
+        # Levels only grow deeper down the tree
+        levels = range(1, bottom + 1)
+        return max((l for l in levels if len(division_tree[l]) <= p), default=1)
+    return bottom
+
+
+def _keys(level: int, clusters: np.ndarray) -> np.ndarray:
+    return np.column_stack([np.full(len(clusters), level), clusters])
+
+
+def _concatenate(clusters: list[list]) -> np.ndarray:
+    if not clusters:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate([np.asarray(c, dtype=np.int64) for c in clusters])
+
+
+def _segments(lines: np.ndarray, along_level: bool, horizontal: bool) -> np.ndarray:
+    # End points in (leaf, level) coordinates - (x, y) of the vertical
+    # dendrogram, swapped for the horizontal one
+    position, start, stop = lines.T
+    if along_level:
+        first, second = (position, start), (position, stop)
+    else:
+        first, second = (start, position), (stop, position)
+    ends = np.stack([np.column_stack(first), np.column_stack(second)], axis=1)
+    return ends[:, :, ::-1] if horizontal else ends
@@ -0,0 +1,46 @@
+import pytest
+from benchmarks.shootout import FIELDS, fastest, shootout
+from benchmarks.suite import TIME_SLACK, compare, run, save_baseline, load_baseline
+
+
+def test_regressions_against_baseline(tmp_path):
+    results = run(["split_sample"], quick=True, repeat=1)
+    assert list(results) == ["split_sample[1024]"]
+    assert results["split_sample[1024]"]["seconds"] > 0
+    assert results["split_sample[1024]"]["peak_bytes"] > 0
+
+    path = str(tmp_path / "baseline.json")
+    save_baseline(results, path)
+    baseline = load_baseline(path)
+    assert compare(results, baseline) == []
+
+    slower = {
+        key: {
+            "seconds": 2 * r["seconds"] + TIME_SLACK,
+            "peak_bytes": r["peak_bytes"] + 2**20,
+        }
+        for key, r in results.items()
+    }
+    assert len(compare(slower, baseline)) == 2
+    # Short cases are not flagged for slowdowns within the time slack
+    noisy = {
+        key: {"seconds": 2 * r["seconds"], "peak_bytes": r["peak_bytes"]}
+        for key, r in results.items()
+    }
+    assert compare(noisy, baseline) == []
+    # Cases missing from the baseline are not compared
+    assert compare(slower, {}) == []
+
+
+def test_shootout_tidy_rows():
+    rows = shootout(["louvain", "spectral"], ["clique_chain"], (32,), (1, 2), 2)
+    assert len(rows) == 2 * 2 * 2
+    assert all(set(row) == set(FIELDS) and not row["error"] for row in rows)
+    assert all(0 <= row["solver_time"] <= row["wall_time"] for row in rows)
+    # Four cliques of eight nodes at the resolution one
+    assert {row["communities"] for row in rows if row["resolution"] == 1} == {4}
+
+    chosen = fastest(rows, target=0.9)
+    assert set(chosen) == {("clique_chain", 32, 1), ("clique_chain", 32, 2)}
+    with pytest.raises(ValueError):
+        shootout(["simplex"])
@@ -0,0 +1,224 @@
+import os
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+import pytest
+from matplotlib.collections import LineCollection, PathCollection
+from dendro import Dendrogram, export_dendrograms
+from dendro import dendro as dendro_module
+from dendro.layout import DendrogramLayout
+from Qommunity.iterative_searcher import IterativeSearcher, load_sampleset
+from Qommunity.samplers.hierarchical.spectral_sampler import SpectralSampler
+from Qommunity.searchers.hierarchical_searcher import HierarchicalSearcher
+
+
+@pytest.fixture
+def dendrogram():
+    G = nx.ring_of_cliques(16, 4)
+    communities, division_tree, division_modularities = HierarchicalSearcher(
+        SpectralSampler(G, seed=0)
+    ).hierarchical_community_search(division_tree=True, return_modularities=True)
+    return Dendrogram(
+        G, [list(c) for c in communities], division_modularities, division_tree
+    )
+
+
+@pytest.mark.parametrize("horizontal", [False, True])
+def test_tree_drawn_as_batched_collections(dendrogram, horizontal):
+    if horizontal:
+        dendrogram.draw_horizontal(show_plot=False, color_seed=1)
+    else:
+        dendrogram.draw(show_plot=False, color_seed=1)
+    ax = dendrogram.R["ax"]
+
+    # One scatter per community
+    markers = [c for c in ax.collections if isinstance(c, PathCollection)]
+    assert len(markers) == len(dendrogram.communities)
+    assert sum(len(m.get_offsets()) for m in markers) == dendrogram.G.number_of_nodes()
+
+    # Clade lines, connectors and leaf lines, plus three lines per level
+    # marking the modularity increments of the vertical dendrogram
+    lines = [c for c in ax.collections if isinstance(c, LineCollection)]
+    levels = len(dendrogram.division_tree) - 1
+    assert len(lines) == 1 + (0 if horizontal else 3 * levels)
+    plt.close(dendrogram.R["fig"])
+
+
+def _tree_lines_one_by_one(self, ax, layout, rgba, leaf_lines_style, horizontal=False):
+    # Reference rendering - one artist per line, level after level from the
+    # bottom up and cluster after cluster, the clade line first
+    tree = self.division_tree
+    order = []
+    for i in range(len(tree[-1])):
+        order += [("clade_lines", i), ("leaf_lines", i)]
+    clade, connector = len(tree[-1]), 0
+    for level in reversed(range(len(tree) - 1)):
+        for cluster in tree[level]:
+            if level != 0:
+                order.append(("clade_lines", clade))
+                clade += 1
+            if sum(set(sub) <= set(cluster) for sub in tree[level + 1]) == 2:
+                order.append(("connector_lines", connector))
+                connector += 1
+
+    segments = layout.segments(horizontal)
+    for name, i in order:
+        (x0, y0), (x1, y1) = segments[name][i]
+        style = {"colors": "gray", "alpha": 0.8}
+        if name == "leaf_lines":
+            style = {
+                "colors": [rgba[layout.leaf_line_communities[i]]],
+                "alpha": leaf_lines_style["alpha"],
+                "linewidth": leaf_lines_style["linewidth"],
+            }
+        if x0 == x1:
+            ax.vlines(x=x0, ymin=y0, ymax=y1, **style)
+        else:
+            ax.hlines(y=y0, xmin=x0, xmax=x1, **style)
+
+
+def _leafs_one_by_one(self, ax, layout, rgba, leafs_scatter_style, horizontal=False):
+    # Reference rendering - one scatter per leaf, cluster after cluster
+    rows = {node: row for row, node in enumerate(layout.leafs_ordering.tolist())}
+    points = layout.markers(horizontal)
+    for cluster in self.division_tree[-1]:
+        for node in cluster:
+            ax.scatter(
+                *points[rows[node]],
+                color=rgba[layout.leaf_communities[rows[node]]],
+                s=leafs_scatter_style["s"],
+                alpha=leafs_scatter_style["alpha"],
+            )
+
+
+def _render(dendrogram, variant):
+    if variant == "horizontal":
+        dendrogram.draw_horizontal(show_plot=False, color_seed=3)
+    else:
+        dendrogram.draw(
+            show_plot=False, color_seed=3, display_leafs=variant == "leafs"
+        )
+    fig = dendrogram.R["fig"]
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba()).copy()
+    plt.close(fig)
+    return image
+
+
+@pytest.mark.parametrize("variant", ["leafs", "lines", "horizontal"])
+def test_batched_tree_matches_artists_drawn_one_by_one(monkeypatch, variant):
+    G = nx.karate_club_graph()
+    communities, division_tree, division_modularities = HierarchicalSearcher(
+        SpectralSampler(G, seed=0)
+    ).hierarchical_community_search(division_tree=True, return_modularities=True)
+    dendrogram = Dendrogram(
+        G, [list(c) for c in communities], division_modularities, division_tree
+    )
+
+    image = _render(dendrogram, variant)
+    monkeypatch.setattr(Dendrogram, "_draw_tree_lines", _tree_lines_one_by_one)
+    monkeypatch.setattr(Dendrogram, "_draw_leafs", _leafs_one_by_one)
+    expected = _render(dendrogram, variant)
+
+    # Translucent lines overlap at the base and at the connectors
+    assert (image == expected).all()
+
+
+def test_layout_shared_by_both_orientations(dendrogram):
+    dendrogram.draw(show_plot=False)
+    layout = dendrogram.R["layout"]
+    dendrogram.draw_horizontal(show_plot=False)
+    assert dendrogram.R["layout"] is layout
+    plt.close("all")
+
+    n = dendrogram.G.number_of_nodes()
+    assert sorted(layout.leafs_ordering) == list(range(n))
+    # Every split has a connector, every cluster of every level but the
+    # first a clade line
+    splits = sum(len(level) for level in dendrogram.division_tree[1:]) - sum(
+        len(level) for level in dendrogram.division_tree[:-1]
+    )
+    assert len(layout.connector_lines) == splits
+    assert len(layout.clade_lines) == sum(
+        len(level) for level in dendrogram.division_tree[1:]
+    )
+
+    vertical, horizontal = layout.segments(), layout.segments(horizontal=True)
+    for name, segments in vertical.items():
+        assert segments.shape == (len(getattr(layout, name)), 2, 2)
+        assert (horizontal[name] == segments[:, :, ::-1]).all()
+    assert (vertical["clade_lines"][:, 0, 0] == vertical["clade_lines"][:, 1, 0]).all()
+
+    assert dendrogram.layout(yaxis_abs_log=True) is not layout
+
+
+@pytest.mark.parametrize("horizontal", [False, True])
+def test_truncated_tree_collapses_clades(dendrogram, horizontal, monkeypatch):
+    layouts = []
+
+    class RecordedLayout(DendrogramLayout):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            layouts.append(self)
+
+    monkeypatch.setattr(dendro_module, "DendrogramLayout", RecordedLayout)
+    draw = dendrogram.draw_horizontal if horizontal else dendrogram.draw
+    draw(show_plot=False, truncate_mode="lastp", p=5)
+    layout = dendrogram.R["layout"]
+    ax = dendrogram.R["ax"]
+
+    # Only the truncated layout is built
+    assert layouts == [layout]
+    assert layout.truncated
+    clades = len(layout.leaf_positions)
+    assert 1 < clades <= 5
+    assert layout.clade_sizes.sum() == dendrogram.G.number_of_nodes()
+    markers = [c for c in ax.collections if isinstance(c, PathCollection)]
+    assert sum(len(m.get_offsets()) for m in markers) == clades
+    ticklabels = ax.get_yticklabels() if horizontal else ax.get_xticklabels()
+    assert [t.get_text() for t in ticklabels] == [
+        f"({size})" for size in layout.clade_sizes
+    ]
+    plt.close("all")
+
+    # Level 1 holds the two halves of the graph
+    layout = dendrogram.layout(truncate_mode="level", p=1)
+    assert len(layout.leaf_positions) == 2
+    assert len(layout.connector_lines) == 1
+    assert not dendrogram.layout(truncate_mode="level", p=100).truncated
+    with pytest.raises(ValueError):
+        dendrogram.layout(truncate_mode="top")
+    with pytest.raises(ValueError):
+        dendrogram.layout(truncate_mode="lastp", p=1)
+
+
+def test_export_dendrograms_from_saved_sampleset(tmp_path):
+    G = nx.karate_club_graph()
+    IterativeSearcher(SpectralSampler(G, seed=0)).run_with_sampleset_info(
+        3, saving_path=str(tmp_path / "karate"), seed=0
+    )
+    sampleset = load_sampleset(str(tmp_path / "karate"))
+
+    exported = export_dendrograms(
+        G,
+        sampleset,
+        str(tmp_path / "out"),
+        formats=("png", "svg"),
+        runs=[2, 0],
+        workers=2,
+        color_seed=1,
+    )
+
+    assert list(exported) == [2, 0]
+    for run, paths in exported.items():
+        assert paths == [
+            str(tmp_path / "out" / f"dendrogram_{run}.{extension}")
+            for extension in ("png", "svg")
+        ]
+        assert all(os.path.getsize(path) > 0 for path in paths)
+    assert not plt.get_fignums()
+    with pytest.raises(ValueError):
+        export_dendrograms(G, sampleset, str(tmp_path / "out"), formats=("bmp",))
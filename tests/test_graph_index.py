@@ -0,0 +1,113 @@
+import pytest
+import numpy as np
+import networkx as nx
+from QHyper.problems.community_detection import Network, CommunityDetectionProblem
+from Qommunity.samplers.graph_index import GraphIndex
+from Qommunity.samplers.partition import Partition
+from Qommunity.samplers.utils import (
+    SampleDecoder,
+    communities_to_labels,
+    labels_to_communities,
+)
+
+
+@pytest.fixture()
+def example_graph():
+    return nx.karate_club_graph()
+
+
+@pytest.mark.parametrize("resolution", [1, 0.5])
+def test_generalized_modularity_matrix(example_graph, resolution):
+    community = [0, 2, 3, 7, 11, 13, 21, 33]
+    network = Network(example_graph, resolution=resolution, community=community)
+    index = GraphIndex(example_graph)
+
+    B_g = index.generalized_modularity_matrix(community, resolution)
+
+    assert np.allclose(B_g, network.generalized_modularity_matrix)
+
+
+@pytest.mark.parametrize("weight", ["weight", None])
+def test_community_qubo(example_graph, weight):
+    community = [*range(example_graph.number_of_nodes())]
+    network = Network(example_graph, weight=weight, community=community)
+    problem = CommunityDetectionProblem(network, communities=2, one_hot_encoding=False)
+    expected = problem.objective_function.terms
+
+    qubo = GraphIndex(example_graph, weight=weight).community_qubo(community)
+
+    assert qubo.keys() == expected.keys()
+    assert all(np.isclose(qubo[key], expected[key]) for key in expected)
+
+
+def test_modularity_operator_energy_and_flip_gains(example_graph):
+    community = [0, 2, 3, 7, 11, 13, 21, 33]
+    operator = GraphIndex(example_graph).operator(community, resolution=0.8)
+    B_g = operator.to_dense()
+
+    x = np.random.default_rng(0).integers(0, 2, (4, len(community)))
+    energies = np.array([-sample @ B_g @ sample for sample in x])
+    assert np.allclose(operator.energy(x), energies)
+
+    gains = operator.flip_gains(x)
+    for i in range(len(community)):
+        flipped = x.copy()
+        flipped[:, i] = 1 - flipped[:, i]
+        assert np.allclose(operator.energy(flipped) - energies, gains[:, i])
+
+
+@pytest.mark.parametrize("resolution", [1, 0.5, 2])
+def test_batch_modularity_matches_networkx(example_graph, resolution):
+    G = example_graph.copy()
+    G.add_edge(5, 5, weight=2)
+    labels = np.random.default_rng(0).integers(0, 4, (10, G.number_of_nodes()))
+
+    modularities = GraphIndex(G).batch_modularity(labels, resolution)
+
+    for partition, modularity in zip(labels, modularities):
+        communities = [np.flatnonzero(partition == c) for c in np.unique(partition)]
+        expected = nx.community.modularity(G, communities, resolution=resolution)
+        assert np.isclose(modularity, expected)
+
+
+def test_communities_to_labels_not_a_partition():
+    with pytest.raises(ValueError):
+        communities_to_labels([[0, 1], [1, 2]], 3)
+    with pytest.raises(ValueError):
+        communities_to_labels([[0, 1]], 3)
+
+
+def test_partition_list_compatibility():
+    communities = [[3, 0], [1, 4], [2]]
+    partition = Partition.from_communities(communities, 5)
+
+    assert partition.labels.dtype == np.int32
+    assert list(partition.labels) == [0, 1, 2, 0, 1]
+    assert len(partition) == 3
+    assert partition[0] == [0, 3]
+    assert partition == [[0, 3], [1, 4], [2]]
+    assert partition == Partition([0, 1, 2, 0, 1])
+    assert partition != [[2], [4, 1], [3, 0]]
+    assert partition != Partition([2, 0, 1, 2, 0])
+    assert partition != [1, 2, 3]
+    assert partition.same_communities([[2], [4, 1], [3, 0]])
+    assert partition.same_communities(Partition([2, 0, 1, 2, 0]))
+    assert not partition.same_communities([[0, 3], [1, 2, 4]])
+    assert not partition.same_communities(Partition([0, 1, 1, 0, 1]))
+    assert partition.to_dict() == {"x0": 0, "x1": 1, "x2": 2, "x3": 0, "x4": 1}
+    assert sorted(map(sorted, partition)) == sorted(map(sorted, communities))
+
+
+def test_sample_decoder_permutes_columns():
+    community = [7, 2, 10]
+    dtype = [("x10", int), ("x2", int), ("x7", int), ("probability", float)]
+    probabilities = np.array([(1, 0, 1, 0.75), (0, 1, 0, 0.25)], dtype=dtype)
+    decoder = SampleDecoder(community)
+
+    labels = decoder.decode(probabilities)
+    assert list(labels) == [1, 0, 1]
+    assert decoder.to_dict(labels) == {"x7": 1, "x2": 0, "x10": 1}
+
+    # Variables missing from the record are labelled ``missing``
+    assert list(SampleDecoder([2, 5]).decode(probabilities)) == [0, 1]
+    assert labels_to_communities([1, 0, 1], community, 2) == [[2], [7, 10]]
@@ -9,6 +9,9 @@ from Qommunity.samplers.regular.louvain_sampler import LouvainSampler
 from Qommunity.samplers.hierarchical.hierarchical_sampler import HierarchicalSampler
 from Qommunity.samplers.hierarchical.advantage_sampler import AdvantageSampler
 from Qommunity.samplers.hierarchical.gurobi_sampler import GurobiSampler
+from Qommunity.samplers.hierarchical.local_sampler import LocalSampler
+from Qommunity.samplers.hierarchical.tempering_sampler import TemperingSampler
+from Qommunity.samplers.hierarchical.spectral_sampler import SpectralSampler
 
 
 def get_all_subclasses(cls):
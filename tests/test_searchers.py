@@ -1,7 +1,29 @@
+import asyncio
+import json
+import threading
 import pytest
 import networkx as nx
+import numpy as np
+from scipy.cluster import hierarchy
+from time import time
 from Qommunity.searchers.regular_searcher import RegularSearcher
+from Qommunity.iterative_searcher import IterativeSearcher, ResultLog
+from Qommunity.searchers.hierarchical_searcher import (
+    AsyncHierarchicalSearcher,
+    DivisionTree,
+    HierarchicalSearcher,
+    KernighanLinRefinement,
+    ParallelHierarchicalSearcher,
+    SplitCache,
+)
 from Qommunity.samplers.regular.louvain_sampler import LouvainSampler
+from Qommunity.samplers.hierarchical.hierarchical_sampler import HierarchicalSampler
+from Qommunity.samplers.graph_index import GraphIndex
+from Qommunity.samplers.tracer import NULL_TRACER, Tracer
+from Qommunity.samplers.hierarchical.local_sampler import LocalSampler
+from Qommunity.samplers.hierarchical.latency_sampler import LatencySampler
+from Qommunity.samplers.hierarchical.tempering_sampler import TemperingSampler
+from Qommunity.samplers.hierarchical.spectral_sampler import SpectralSampler
 
 
 @pytest.fixture
@@ -25,6 +47,21 @@ def test_community_search_verbosity_0_return_list(regular_sampler, capsys):
     assert captured.out == ""
 
 
+def test_community_search_on_graph_with_string_nodes():
+    G = nx.relabel_nodes(nx.karate_club_graph(), lambda node: f"n{node}")
+    expected = nx.community.louvain_communities(G, seed=0)
+
+    result = RegularSearcher(LouvainSampler(G, seed=0)).community_search()
+    assert sorted(map(sorted, result)) == sorted(map(sorted, expected))
+    assert result.to_dict()["xn33"] == result.to_dict()["xn32"]
+
+    communities, modularities, _ = IterativeSearcher(LouvainSampler(G)).run(
+        2, save_results=False, seed=0
+    )
+    for partition, modularity in zip(communities, modularities):
+        assert modularity == pytest.approx(nx.community.modularity(G, partition))
+
+
 def test_community_search_verbosity_2_return_list_false(regular_sampler, capsys):
     community_searcher = RegularSearcher(regular_sampler)
     community_searcher.community_search(verbosity=2, return_list=False)
@@ -43,3 +80,431 @@ def test_communities_to_list(regular_sampler):
     assert isinstance(result, list)
     assert len(result) == 2
     assert result == [["a", "b", "c"], ["d"]]
+
+
+class BisectionSampler(HierarchicalSampler):
+    # Deterministic local sampler - Kernighan-Lin bisection kept only when
+    # it increases modularity
+    def __init__(self, G: nx.Graph, resolution: float = 1, community: list = None):
+        self.G = G
+        self.resolution = resolution
+        self.community = community or [*range(G.number_of_nodes())]
+
+    def sample_qubo_to_dict(self) -> dict:
+        rest = set(self.G.nodes) - set(self.community)
+        c0, c1 = nx.community.kernighan_lin_bisection(
+            self.G.subgraph(self.community), seed=0
+        )
+        before = nx.community.modularity(
+            self.G, [rest, set(self.community)] if rest else [set(self.community)]
+        )
+        after = nx.community.modularity(self.G, [rest, c0, c1] if rest else [c0, c1])
+        if after <= before:
+            return {f"x{i}": 0 for i in self.community}
+        return {f"x{i}": int(i in c1) for i in self.community}
+
+    def update_community(self, community: list) -> None:
+        self.community = community
+
+
+@pytest.fixture
+def hierarchical_sampler():
+    G = nx.ring_of_cliques(8, 4)
+    return BisectionSampler(G)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parallel_hierarchical_search_matches_recursion(
+    hierarchical_sampler, workers
+):
+    expected = HierarchicalSearcher(hierarchical_sampler).hierarchical_community_search(
+        division_tree=True, return_modularities=True
+    )
+    result = ParallelHierarchicalSearcher(
+        hierarchical_sampler, workers=workers
+    ).hierarchical_community_search(division_tree=True, return_modularities=True)
+
+    assert result == expected
+
+
+def test_parallel_hierarchical_search_invalid_executor(hierarchical_sampler):
+    with pytest.raises(ValueError):
+        ParallelHierarchicalSearcher(hierarchical_sampler, executor="gpu")
+
+
+def test_division_modularities_match_networkx(hierarchical_sampler):
+    searcher = HierarchicalSearcher(hierarchical_sampler)
+    _, division_tree, division_modularities = searcher.hierarchical_community_search(
+        division_tree=True, return_modularities=True
+    )
+
+    expected = [
+        nx.community.modularity(hierarchical_sampler.G, division)
+        for division in division_tree
+    ]
+    assert len(division_modularities) == len(division_tree) > 2
+    assert division_modularities == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("node_labels", ["shuffled", "strings"])
+def test_modularity_of_graph_node_communities(node_labels):
+    karate = nx.karate_club_graph()
+    G = nx.Graph()
+    G.add_nodes_from(np.random.default_rng(0).permutation(len(karate)).tolist())
+    G.add_edges_from(karate.edges(data=True))
+    if node_labels == "strings":
+        G = nx.relabel_nodes(G, {node: f"n{node}" for node in G})
+    communities = nx.community.louvain_communities(G, seed=0)
+
+    expected = nx.community.modularity(G, communities)
+    assert RegularSearcher(LouvainSampler(G)).modularity(communities) == (
+        pytest.approx(expected)
+    )
+    assert HierarchicalSearcher(SpectralSampler(G)).modularity(communities) == (
+        pytest.approx(expected)
+    )
+
+
+@pytest.mark.parametrize("method", ["simulated_annealing", "steepest_descent"])
+def test_local_sampler_seeded_search_is_reproducible(method):
+    G = nx.ring_of_cliques(8, 4)
+    results = [
+        HierarchicalSearcher(
+            LocalSampler(G, method=method, num_reads=10, seed=0)
+        ).hierarchical_community_search()
+        for _ in range(2)
+    ]
+
+    assert results[0] == results[1]
+    assert len(results[0]) == 8
+
+
+def test_tempering_sampler_replica_energies():
+    G = nx.ring_of_cliques(8, 4)
+    sampler = TemperingSampler(G, num_replicas=8, num_sweeps=50, seed=0)
+    sampler.sample_qubo_to_dict()
+
+    operator = sampler.index.operator(sampler.community)
+    assert sampler.replica_samples.shape == (8, G.number_of_nodes())
+    assert sampler.replica_energies == pytest.approx(
+        operator.energy(sampler.replica_samples)
+    )
+
+    result = HierarchicalSearcher(sampler).hierarchical_community_search()
+    assert sorted(map(sorted, result)) == [
+        [*range(i, i + 4)] for i in range(0, 32, 4)
+    ]
+
+
+def test_spectral_sampler_karate_club_and_indivisibility():
+    G = nx.karate_club_graph()
+    sampler = SpectralSampler(G, use_weights=False)
+    _, division_tree = HierarchicalSearcher(sampler).hierarchical_community_search(
+        division_tree=True
+    )
+
+    # Newman (2006): the leading eigenvector recovers the factions but node 8
+    mr_hi = {node for node in G if G.nodes[node]["club"] == "Mr. Hi"} - {8}
+    assert {frozenset(c) for c in division_tree[1]} == {
+        frozenset(mr_hi),
+        frozenset(G) - frozenset(mr_hi),
+    }
+
+    sampler.update_community([0, 1, 2, 3])
+    assert set(sampler.sample_qubo_to_dict().values()) == {0}
+    assert sampler.indivisible
+
+
+def test_refinement_repairs_perturbed_split():
+    G = nx.ring_of_cliques(8, 4)
+    index = GraphIndex(G)
+    c0, c1 = [*range(16)], [*range(16, 32)]
+    # Swap one node of each clique on both sides of the cut
+    noisy_c0 = [node for node in c0 if node != 15] + [16]
+    noisy_c1 = [node for node in c1 if node != 16] + [15]
+
+    r0, r1 = KernighanLinRefinement().refine(index, noisy_c0, noisy_c1)
+
+    assert {frozenset(r0), frozenset(r1)} == {frozenset(c0), frozenset(c1)}
+    assert index.split_gain(r0, r1) > index.split_gain(noisy_c0, noisy_c1)
+
+
+def test_division_tree_structure(hierarchical_sampler):
+    searcher = HierarchicalSearcher(hierarchical_sampler)
+    result, levels, modularities = searcher.hierarchical_community_search(
+        division_tree=True, return_modularities=True
+    )
+    _, tree, tree_modularities = searcher.hierarchical_community_search(
+        division_tree="tree", return_modularities=True
+    )
+
+    assert isinstance(tree, DivisionTree)
+    assert tree.to_levels() == levels
+    assert tree_modularities == modularities
+    assert [tree.community(leaf) for leaf in tree.leaves()] == result
+    assert np.array_equal(tree.labels(), result.labels)
+
+    parent, children = tree.parent, tree.children
+    assert parent[0] == -1
+    for cluster, pair in enumerate(children):
+        if pair[0] != -1:
+            assert list(parent[pair]) == [cluster, cluster]
+            assert tree.sizes[cluster] == tree.sizes[pair].sum()
+            assert not np.isnan(tree.gain[cluster])
+
+    Z = tree.linkage()
+    assert hierarchy.is_valid_linkage(Z)
+    assert hierarchy.to_tree(Z).get_count() == len(result)
+    assert hierarchy.leaves_list(Z).tolist() == list(range(len(result)))
+
+
+def test_hierarchical_search_with_refinement():
+    G = nx.karate_club_graph()
+    sampler = LocalSampler(G, method="steepest_descent", num_reads=1, seed=0)
+
+    _, plain = HierarchicalSearcher(sampler).hierarchical_community_search(
+        return_modularities=True
+    )
+    _, refined = HierarchicalSearcher(
+        sampler, refinement=KernighanLinRefinement()
+    ).hierarchical_community_search(return_modularities=True)
+
+    assert refined > plain
+    assert refined == pytest.approx(0.4449, abs=1e-4)
+
+
+def test_split_cache_reuses_splits(hierarchical_sampler, tmp_path):
+    expected = HierarchicalSearcher(hierarchical_sampler).hierarchical_community_search()
+
+    cache = SplitCache(path=str(tmp_path / "splits.db"))
+    searcher = HierarchicalSearcher(hierarchical_sampler, cache=cache)
+    assert searcher.hierarchical_community_search() == expected
+    splits = cache.misses
+    assert cache.hits == 0 and splits > 0
+
+    assert searcher.hierarchical_community_search() == expected
+    assert (cache.hits, cache.misses) == (splits, splits)
+
+    # A new cache shares the splits through the database
+    disk_cache = SplitCache(path=str(tmp_path / "splits.db"))
+    result = ParallelHierarchicalSearcher(
+        hierarchical_sampler, workers=4, cache=disk_cache
+    ).hierarchical_community_search()
+    assert result == expected
+    assert disk_cache.disk_hits == splits and disk_cache.misses == 0
+
+
+def test_split_cache_lru_eviction():
+    cache = SplitCache(maxsize=2)
+    for key in "abc":
+        cache.put(key, [key])
+    cache.get("b")
+    cache.put("d", ["d"])
+
+    assert cache.get("a") is None and cache.get("c") is None
+    assert cache.get("b") == ["b"] and cache.get("d") == ["d"]
+    assert (cache.hits, cache.misses) == (3, 2)
+
+
+@pytest.mark.parametrize("sampler_class", [LouvainSampler, LocalSampler])
+def test_iterative_runs_on_workers_match_serial_runs(sampler_class):
+    sampler = sampler_class(nx.karate_club_graph())
+    searcher = IterativeSearcher(sampler)
+
+    serial = searcher.run(4, save_results=False, seed=7)
+    parallel = searcher.run(4, save_results=False, seed=7, workers=2)
+
+    assert list(serial[0]) == list(parallel[0])
+    assert (serial[1] == parallel[1]).all()
+    assert len(parallel[2]) == 4
+
+
+def test_sampleset_runs_on_workers_match_serial_runs():
+    searcher = IterativeSearcher(LocalSampler(nx.karate_club_graph()))
+
+    serial = searcher.run_with_sampleset_info(4, save_results=False, seed=7, workers=1)
+    parallel = searcher.run_with_sampleset_info(
+        4, save_results=False, seed=7, workers=2
+    )
+
+    assert serial.dtype == parallel.dtype
+    assert serial.modularity.dtype == np.float64
+    assert list(serial.communities) == list(parallel.communities)
+    assert (serial.modularity == parallel.modularity).all()
+    assert list(serial.division_tree) == list(parallel.division_tree)
+    assert list(serial.division_modularities) == list(parallel.division_modularities)
+    assert len(parallel.time) == 4
+
+
+def test_async_search_matches_recursion_without_async_sampler(hierarchical_sampler):
+    expected = HierarchicalSearcher(hierarchical_sampler).hierarchical_community_search(
+        division_tree=True
+    )
+    result = AsyncHierarchicalSearcher(
+        hierarchical_sampler, max_in_flight=3
+    ).hierarchical_community_search(division_tree=True)
+
+    assert result == expected
+
+
+def test_async_search_overlaps_latency():
+    G = nx.ring_of_cliques(8, 4)
+    sampler = LatencySampler(G, latency=0.1, num_reads=10, seed=0)
+    searcher = AsyncHierarchicalSearcher(sampler, max_in_flight=8)
+
+    elapsed = time()
+    result = asyncio.run(searcher.hierarchical_community_search_async())
+    elapsed = time() - elapsed
+
+    assert sorted(map(sorted, result)) == [
+        [*range(i, i + 4)] for i in range(0, 32, 4)
+    ]
+    # 15 splits in 4 levels of the division tree
+    assert elapsed < 1.0
+
+
+def test_latency_sampler_solves_off_the_event_loop(monkeypatch):
+    threads = []
+    solve = LocalSampler.sample_qubo_to_labels
+
+    def recorded(self, community):
+        threads.append(threading.get_ident())
+        return solve(self, community)
+
+    monkeypatch.setattr(LocalSampler, "sample_qubo_to_labels", recorded)
+    sampler = LatencySampler(nx.ring_of_cliques(4, 4), latency=0, seed=0)
+
+    async def sample():
+        loop_thread = threading.get_ident()
+        labels = await sampler.sample_community_async([*range(16)])
+        return loop_thread, labels
+
+    loop_thread, labels = asyncio.run(sample())
+    assert len(labels) == 16
+    assert threads and loop_thread not in threads
+
+
+def test_result_log_discards_torn_chunk(tmp_path):
+    path = str(tmp_path / "runs.log")
+    log = ResultLog(path)
+    log.append(0, modularities=0.5, communities=[[0, 1]])
+    log.append(1, modularities=0.25, communities=[[0], [1]])
+    with open(path, "ab") as file:
+        file.write(b"\x40\x00\x00")
+
+    log = ResultLog(path, resume=True)
+    assert log.completed() == {0, 1}
+    log.append(2, modularities=0.75, communities=[[1], [0]])
+
+    arrays = ResultLog(path, resume=True).to_arrays()
+    assert list(arrays["modularities"]) == [0.5, 0.25, 0.75]
+    assert arrays["communities"][1] == [[0], [1]]
+    assert len(ResultLog(path)) == 0
+
+
+def test_iterative_run_resume(tmp_path):
+    searcher = IterativeSearcher(LouvainSampler(nx.karate_club_graph()))
+    saving_path = str(tmp_path / "louvain")
+
+    expected = searcher.run(4, saving_path=str(tmp_path / "full"), seed=3)
+    searcher.run(2, saving_path=saving_path, seed=3)
+    communities, modularities, times = searcher.run(
+        4, saving_path=saving_path, seed=3, resume=True
+    )
+
+    assert list(communities) == list(expected[0])
+    assert (modularities == expected[1]).all()
+    assert (np.load(f"{saving_path}_modularities.npy") == modularities).all()
+
+
+def test_iterative_saved_communities_are_plain_lists(tmp_path):
+    searcher = IterativeSearcher(LocalSampler(nx.karate_club_graph()))
+    saving_path = str(tmp_path / "local")
+
+    communities, _, _ = searcher.run(2, saving_path=saving_path, seed=1)
+    saved = np.load(f"{saving_path}_communities.npy", allow_pickle=True)
+    assert all(type(result) is list for result in saved)
+    assert list(saved) == list(communities)
+
+    with pytest.raises(ValueError, match="division_trees"):
+        searcher.run_with_sampleset_info(2, saving_path=saving_path, resume=True)
+
+
+def test_run_summary_matches_full_runs():
+    searcher = IterativeSearcher(LouvainSampler(nx.karate_club_graph()))
+    communities, modularities, _ = searcher.run(12, save_results=False, seed=5)
+    summary = searcher.run_summary(12, best_k=3, sample_size=4, seed=5)
+
+    assert summary.runs == 12
+    assert summary.modularity.mean == pytest.approx(modularities.mean())
+    assert summary.modularity.variance == pytest.approx(modularities.var())
+    assert summary.modularity.max == modularities.max()
+    assert sum(summary.community_counts.values()) == 12
+
+    best_modularity, best_iteration, best_communities = summary.best[0]
+    assert best_modularity == modularities.max()
+    assert best_communities == communities[best_iteration]
+
+    sample = summary.sample
+    assert len(sample) == 4
+    assert all(sample[iteration] == communities[iteration] for iteration in sample)
+    parallel = searcher.run_summary(12, sample_size=4, seed=5, workers=2)
+    assert list(parallel.sample) == list(sample)
+
+
+def test_tracer_records_phases_of_every_split():
+    G = nx.ring_of_cliques(8, 4)
+    sampler = LocalSampler(G, num_reads=10, seed=0)
+    tracer = Tracer()
+    searcher = HierarchicalSearcher(sampler, tracer=tracer)
+    communities, _, _ = searcher.hierarchical_community_search(
+        division_tree=True, return_modularities=True
+    )
+    assert sampler.tracer is tracer
+
+    # 8 cliques split 7 times, each clique sampled once more as indivisible
+    totals = tracer.totals()
+    for phase in ("qubo", "sample", "solve", "decode", "split"):
+        assert totals[phase]["count"] == 15
+    assert totals["modularity"]["count"] == 7
+    assert totals["search"]["count"] == totals["division_tree"]["count"] == 1
+    assert totals["solve"]["seconds"] <= totals["sample"]["seconds"]
+
+    trace = tracer.to_chrome()
+    events = trace["traceEvents"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    root = next(event for event in events if event["name"] == "search")
+    assert root["args"] == {"size": 32, "depth": 0, "sampler": "LocalSampler"}
+    depths = {e["args"]["depth"] for e in events if e["name"] == "sample"}
+    assert depths == {1, 2, 3, 4}
+    assert trace["otherData"]["totals"] == totals
+
+    # Untraced searches record nothing and find the same communities
+    searcher.set_tracer(None)
+    assert sampler.tracer is NULL_TRACER
+    sampler.reseed(0)
+    assert searcher.hierarchical_community_search() == communities
+    assert len(tracer.to_chrome()["traceEvents"]) == len(events)
+
+    # Worker threads sample on tracks of their own
+    tracer = Tracer()
+    ParallelHierarchicalSearcher(
+        sampler, workers=2, tracer=tracer
+    ).hierarchical_community_search()
+    events = tracer.to_chrome()["traceEvents"]
+    assert events[0]["name"] == "search" and events[0]["tid"] == 0
+    assert tracer.totals()["sample"]["count"] == 15
+    assert 0 not in {e["tid"] for e in events if e["name"] == "sample"}
+
+
+def test_iterative_runs_dump_traces(tmp_path):
+    sampler = SpectralSampler(nx.ring_of_cliques(4, 4), seed=0)
+    searcher = IterativeSearcher(sampler, trace_dir=str(tmp_path))
+    searcher.run(2, save_results=False, seed=1)
+
+    for iteration in range(2):
+        with open(tmp_path / f"run_{iteration}.json") as file:
+            trace = json.load(file)
+        assert {e["name"] for e in trace["traceEvents"]} >= {"search", "solve"}
+        assert trace["otherData"]["totals"]["split"]["count"] == 7
+    assert sampler.tracer is NULL_TRACER